@@ -0,0 +1,39 @@
+"""
+Move payloads of old plans to compressed cold storage.
+
+Usage:
+    python -m app.archive_plans [--days N] [--vacuum]
+"""
+import argparse
+
+from sqlalchemy import text
+
+from .database import SessionLocal, engine, init_db
+from .config import get_settings
+from .services.archive_service import ArchiveService
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+settings = get_settings()
+
+
+def main() -> None:
+    """Archive plans not updated within the configured age."""
+    parser = argparse.ArgumentParser(description="Archive old feature plans")
+    parser.add_argument("--days", type=int, default=None, help="Archive plans not updated for N days")
+    parser.add_argument("--vacuum", action="store_true", help="Reclaim freed space (SQLite only)")
+    args = parser.parse_args()
+
+    init_db()
+    with SessionLocal() as db:
+        count = ArchiveService.archive_old_plans(db, older_than_days=args.days)
+    logger.info(f"Archiving complete: {count} plan(s) archived")
+
+    if args.vacuum and settings.is_database_sqlite:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        logger.info("Database vacuumed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Compact plan version history to bound storage growth.
+
+Usage:
+    python -m app.compact_versions [--retention N]
+"""
+import argparse
+
+from .database import SessionLocal, init_db
+from .services.version_service import VersionService
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def main() -> None:
+    """Drop versions older than the retention window for every plan."""
+    parser = argparse.ArgumentParser(description="Compact plan version history")
+    parser.add_argument("--retention", type=int, default=None, help="Versions to keep per plan")
+    args = parser.parse_args()
+
+    init_db()
+    with SessionLocal() as db:
+        deleted = VersionService.compact(db, retention=args.retention)
+    logger.info(f"Version compaction complete: {deleted} row(s) deleted")
+
+
+if __name__ == "__main__":
+    main()
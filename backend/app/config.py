@@ -5,33 +5,95 @@ from typing import Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file (from root directory)
+# .env file in the repository root
 dotenv_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(dotenv_path)
 
 
 class Settings:
     """Application settings loaded from environment variables."""
 
-    # Database
-    DATABASE_URL: str = os.getenv(
-        "DATABASE_URL", "sqlite:///./tasks_generator.db"
-    )
+    def __init__(self):
+        # Database
+        self.DATABASE_URL: str = os.getenv(
+            "DATABASE_URL", "sqlite:///./tasks_generator.db"
+        )
 
-    # Groq API
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
-    GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama3.1-8b-instant")
+        # Groq API
+        self.GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+        self.GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama3.1-8b-instant")
+        self.USE_MOCK_LLM: bool = os.getenv("USE_MOCK_LLM", "True").lower() == "true"
+        # "single" (one prompt) or "sectioned" (parallel per-section prompts)
+        self.PLAN_GENERATION_MODE: str = os.getenv("PLAN_GENERATION_MODE", "single").lower()
+        self.LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
 
-    # App
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+        # LLM response cache (SQLite, shared by all workers on the host)
+        self.LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+        self.LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+        self.LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "100"))
 
-    # CORS
-    _default_origins = "http://localhost:5173,http://localhost:3000,https://task-genrated.vercel.app"
-    _env_origins = os.getenv("ALLOWED_ORIGINS", _default_origins)
-    ALLOWED_ORIGINS: list = [
-        origin.strip() for origin in _env_origins.split(",") if origin.strip()
-    ]
+        # Similar plan reuse: "off", "return" (return the existing plan instead of calling
+        # the LLM) or "seed" (call the LLM with the existing plan as a reference to adapt)
+        self.SIMILAR_PLAN_REUSE: str = os.getenv("SIMILAR_PLAN_REUSE", "off").lower()
+        self.SIMILAR_PLAN_THRESHOLD: float = float(os.getenv("SIMILAR_PLAN_THRESHOLD", "0.9"))
+
+        # Plan version history: full snapshot every N versions, keep the last M
+        self.PLAN_SNAPSHOT_INTERVAL: int = int(os.getenv("PLAN_SNAPSHOT_INTERVAL", "10"))
+        self.PLAN_VERSION_RETENTION: int = int(os.getenv("PLAN_VERSION_RETENTION", "100"))
+
+        # Cold-tier archive: compress payloads of plans not updated for N days
+        self.ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+        self.ARCHIVE_LRU_SIZE: int = int(os.getenv("ARCHIVE_LRU_SIZE", "256"))
+
+        # App
+        self.DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+        self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
+        # Serving
+        self.HOST: str = os.getenv("HOST", "0.0.0.0")
+        self.PORT: int = int(os.getenv("PORT", "8000"))
+        self.WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+        # Load the app once in a gunicorn master and fork workers from it
+        self.PRELOAD_APP: bool = os.getenv("PRELOAD_APP", "False").lower() == "true"
+        # Disabled for workers when the launcher has already created the schema
+        self.INIT_DB_ON_STARTUP: bool = os.getenv("INIT_DB_ON_STARTUP", "True").lower() == "true"
+        self.SHUTDOWN_DRAIN_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "30"))
+        # Warm the DB pool, similarity index and LLM client after startup
+        self.WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "True").lower() == "true"
+
+        # Rate limiting (token bucket per API key / IP) and admission control
+        self.RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+        self.RATE_LIMIT_GENERATE_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_GENERATE_PER_MINUTE", "6"))
+        self.RATE_LIMIT_GENERATE_BURST: float = float(os.getenv("RATE_LIMIT_GENERATE_BURST", "3"))
+        self.RATE_LIMIT_READ_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_READ_PER_MINUTE", "120"))
+        self.RATE_LIMIT_READ_BURST: float = float(os.getenv("RATE_LIMIT_READ_BURST", "60"))
+        self.RATE_LIMIT_WRITE_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_WRITE_PER_MINUTE", "30"))
+        self.RATE_LIMIT_WRITE_BURST: float = float(os.getenv("RATE_LIMIT_WRITE_BURST", "10"))
+        # Known client API keys (comma separated); other X-API-Key values are ignored
+        self.RATE_LIMIT_API_KEYS: set = {
+            key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if key.strip()
+        }
+        # Optional shared store, e.g. "mypackage.redis_limits:RedisRateLimitBackend"
+        self.RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "")
+        self.MAX_INFLIGHT_GENERATIONS: int = int(os.getenv("MAX_INFLIGHT_GENERATIONS", "8"))
+        self.ADMISSION_RETRY_AFTER_SECONDS: float = float(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+        # Plan change events (SSE). Bus: "memory" (this process only), "database"
+        # (polls a shared table, works across workers) or "package.module:Class".
+        # Empty picks "database" when WEB_CONCURRENCY > 1, otherwise "memory".
+        self.EVENT_BUS_BACKEND: str = os.getenv("EVENT_BUS_BACKEND", "")
+        self.EVENT_POLL_SECONDS: float = float(os.getenv("EVENT_POLL_SECONDS", "0.5"))
+        self.EVENT_RETENTION_SECONDS: int = int(os.getenv("EVENT_RETENTION_SECONDS", "3600"))
+        self.EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+        self.EVENT_REPLAY_SIZE: int = int(os.getenv("EVENT_REPLAY_SIZE", "256"))
+        self.EVENT_HEARTBEAT_SECONDS: float = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+        self.EVENT_MAX_SUBSCRIBERS: int = int(os.getenv("EVENT_MAX_SUBSCRIBERS", "1000"))
+
+        # CORS
+        default_origins = "http://localhost:5173,http://localhost:3000,https://task-genrated.vercel.app"
+        env_origins = os.getenv("ALLOWED_ORIGINS", default_origins)
+        self.ALLOWED_ORIGINS: list = [
+            origin.strip() for origin in env_origins.split(",") if origin.strip()
+        ]
 
     @property
     def is_database_sqlite(self) -> bool:
@@ -48,5 +110,6 @@ class Settings:
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance."""
+    """Get cached settings instance, loading the .env file on first use."""
+    load_dotenv(dotenv_path)
     return Settings()
@@ -1,8 +1,10 @@
 """Database configuration and session management."""
 import logging
-from sqlalchemy import create_engine, inspect
+from typing import Optional
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from .config import get_settings
 
@@ -21,6 +23,19 @@ engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def create_unpooled_engine():
+    """
+    Engine whose connections are never shared with request sessions.
+
+    With SQLite all request sessions share one connection, so work in a
+    worker thread must not go through ``SessionLocal``; use this instead
+    and dispose of it when done.
+    """
+    return create_engine(settings.DATABASE_URL, poolclass=NullPool, **{
+        key: value for key, value in engine_kwargs.items() if key != "poolclass"
+    })
+
+
 def get_db() -> Session:
     """Dependency to get database session."""
     db = SessionLocal()
@@ -30,12 +45,52 @@ def get_db() -> Session:
         db.close()
 
 
+def _stored_schema_version() -> Optional[int]:
+    """Read the recorded schema version, or None if it was never recorded."""
+    from .models import SchemaVersion
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(SchemaVersion.version)).scalar()
+    except SQLAlchemyError:
+        return None
+
+
 def init_db() -> None:
-    """Initialize database by creating all tables."""
-    from .models import Base
+    """
+    Initialize database by creating all tables.
+
+    Skipped when the stored schema version matches SCHEMA_VERSION, which
+    avoids reflecting every table on each process start.
+    """
+    from .models import Base, SCHEMA_VERSION, SchemaVersion
+    if _stored_schema_version() == SCHEMA_VERSION:
+        logger.info(f"Database schema is up to date (version {SCHEMA_VERSION})")
+        return
+
     logger.info("Initializing database...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database initialized successfully")
+    try:
+        Base.metadata.create_all(bind=engine)
+    except OperationalError as e:
+        # Another process created the tables between the existence check and CREATE
+        if "already exists" not in str(e):
+            raise
+        logger.info("Database tables already created by another process")
+
+    with engine.begin() as conn:
+        conn.execute(SchemaVersion.__table__.delete())
+        conn.execute(SchemaVersion.__table__.insert().values(version=SCHEMA_VERSION))
+    logger.info(f"Database initialized successfully (schema version {SCHEMA_VERSION})")
+
+
+def dispose_engine() -> None:
+    """
+    Drop pooled connections inherited from a parent process.
+
+    Call in each worker after fork; connections are recreated lazily and the
+    parent's connections are left untouched.
+    """
+    engine.dispose(close=False)
+    logger.info("Database engine reset for worker process")
 
 
 def check_db_connection() -> bool:
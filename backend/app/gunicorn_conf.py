@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration for multi-worker serving.
+
+Set PRELOAD_APP=True to import the app once in the master and fork workers.
+
+Usage:
+    gunicorn -c python:app.gunicorn_conf app.main:app
+"""
+import os
+
+# The master creates the schema in on_starting; workers must not repeat it.
+# Set before the settings are first built so preloaded workers inherit it.
+os.environ["INIT_DB_ON_STARTUP"] = "False"
+
+from app.config import get_settings  # noqa: E402
+
+settings = get_settings()
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = max(1, settings.WEB_CONCURRENCY)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.PRELOAD_APP
+graceful_timeout = int(settings.SHUTDOWN_DRAIN_SECONDS)
+timeout = 120  # generations can take a while
+loglevel = settings.LOG_LEVEL.lower()
+
+
+def on_starting(server):
+    """Create the database schema once, before any worker is forked."""
+    from app.database import init_db
+
+    init_db()
+
+
+def post_fork(server, worker):
+    """Give each worker its own database pool and LLM client."""
+    from app.server import reinit_after_fork
+
+    reinit_after_fork()
@@ -1,16 +1,47 @@
 """Main FastAPI application."""
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
-from .database import init_db
-from .routes import features, health
-from .utils.logger import logger
+from .database import check_db_connection, create_unpooled_engine, init_db
+from .routes import analytics, features, health
+from .utils.logger import setup_logger
+from .utils.rate_limit import generation_admission, get_backend
 
 settings = get_settings()
+logger = setup_logger()
+
+
+def _warm_up() -> None:
+    """
+    Fill caches in a worker thread once the app is serving requests.
+
+    Request sessions share one SQLite connection that must only be used on
+    the event loop, so the similarity index is loaded over its own
+    connection rather than through ``SessionLocal``.
+    """
+    from sqlalchemy.orm import Session
+
+    from .services.plan_index import plan_index
+    from .utils.llm import get_client
+
+    try:
+        warmup_engine = create_unpooled_engine()
+        try:
+            with Session(warmup_engine) as db:
+                plan_index.sync(db)
+        finally:
+            warmup_engine.dispose()
+        if not settings.USE_MOCK_LLM:
+            get_client()
+        logger.info("Background warm-up complete")
+    except Exception as e:
+        logger.warning(f"Background warm-up failed: {str(e)}")
 
 
 # Lifespan events
@@ -26,13 +57,35 @@ async def lifespan(app: FastAPI):
         for error in errors:
             logger.warning(f"Configuration warning: {error}")
     
-    # Initialize database
-    init_db()
+    # Load the rate limit backend now so a broken one fails startup, not a request
+    if settings.RATE_LIMIT_ENABLED:
+        get_backend()
+
+    # Initialize database (skipped when a multi-worker launcher already did)
+    if settings.INIT_DB_ON_STARTUP:
+        init_db()
+
+    # Open the shared DB connection here, then warm caches in the background
+    # so startup does not wait for them
+    warmup = None
+    if settings.WARMUP_ON_STARTUP:
+        check_db_connection()
+        warmup = asyncio.create_task(run_in_threadpool(_warm_up))
     
     yield
     
-    # Shutdown
+    # Shutdown: stop admitting generations and let in-flight ones finish
     logger.info("Shutting down Tasks Generator API")
+    if warmup is not None:
+        await warmup
+    drained = await run_in_threadpool(
+        generation_admission.drain, settings.SHUTDOWN_DRAIN_SECONDS
+    )
+    if not drained:
+        logger.warning(
+            f"{generation_admission.inflight} generation(s) still running after "
+            f"{settings.SHUTDOWN_DRAIN_SECONDS}s drain timeout"
+        )
 
 
 # Create FastAPI app
@@ -51,10 +104,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Include routers
 app.include_router(features.router)
+app.include_router(analytics.router)
 app.include_router(health.router)
 
 
@@ -69,10 +124,5 @@ async def root():
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level=settings.LOG_LEVEL.lower()
-    )
+    from .server import main
+    main()
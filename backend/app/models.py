@@ -1,10 +1,21 @@
 """Database models using SQLAlchemy."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, Float, JSON, ForeignKey, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# Bump whenever tables or columns change so init_db re-runs create_all
+SCHEMA_VERSION = 5
+
+
+class SchemaVersion(Base):
+    """Version of the schema last created by init_db."""
+
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+
 
 class FeaturePlan(Base):
     """Feature plan generated from user specifications."""
@@ -24,3 +35,97 @@ class FeaturePlan(Base):
     class Config:
         """Pydantic config."""
         from_attributes = True
+
+
+class PlanTaskRollup(Base):
+    """Per-plan task counts and parsed effort, grouped by category and priority."""
+
+    __tablename__ = "plan_task_rollups"
+
+    plan_id = Column(Integer, ForeignKey("feature_plans.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    priority = Column(String(50), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    effort_min_days = Column(Float, nullable=False, default=0.0)
+    effort_max_days = Column(Float, nullable=False, default=0.0)
+    unparsed_effort_count = Column(Integer, nullable=False, default=0)
+    plan_created_at = Column(DateTime, nullable=False, index=True)
+
+
+class PlanRiskRollup(Base):
+    """Per-plan risk counts grouped by severity."""
+
+    __tablename__ = "plan_risk_rollups"
+
+    plan_id = Column(Integer, ForeignKey("feature_plans.id", ondelete="CASCADE"), primary_key=True)
+    severity = Column(String(50), primary_key=True)
+    risk_count = Column(Integer, nullable=False, default=0)
+    plan_created_at = Column(DateTime, nullable=False, index=True)
+
+
+class TaskTotal(Base):
+    """All-time task totals by category and priority, maintained incrementally."""
+
+    __tablename__ = "task_totals"
+
+    category = Column(String(100), primary_key=True)
+    priority = Column(String(50), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    effort_min_days = Column(Float, nullable=False, default=0.0)
+    effort_max_days = Column(Float, nullable=False, default=0.0)
+    unparsed_effort_count = Column(Integer, nullable=False, default=0)
+
+
+class RiskTotal(Base):
+    """All-time risk totals by severity, maintained incrementally."""
+
+    __tablename__ = "risk_totals"
+
+    severity = Column(String(50), primary_key=True)
+    risk_count = Column(Integer, nullable=False, default=0)
+
+
+class PlanVersion(Base):
+    """
+    One saved version of a plan's engineering tasks.
+
+    Snapshots hold the full tasks JSON; other versions hold a structural
+    diff (see utils/json_diff.py) against the previous version.
+    """
+
+    __tablename__ = "plan_versions"
+
+    plan_id = Column(Integer, ForeignKey("feature_plans.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, primary_key=True)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    payload = Column(Text, nullable=False)  # JSON string
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PlanArchive(Base):
+    """
+    Compressed payload of an archived plan.
+
+    While a plan is archived its user_stories, engineering_tasks and risks
+    columns are empty and the data lives here (see services/archive_service.py).
+    """
+
+    __tablename__ = "plan_archives"
+
+    plan_id = Column(Integer, ForeignKey("feature_plans.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    raw_size = Column(Integer, nullable=False)
+    compressed_size = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PlanEvent(Base):
+    """Plan change event shared between worker processes (see utils/event_bus.py)."""
+
+    __tablename__ = "plan_events"
+    # Never reuse ids once expiry empties the table; pollers track the max id
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    payload = Column(Text, nullable=False)  # JSON string
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,23 @@
+"""
+Rebuild analytics rollups from all stored feature plans.
+
+Usage:
+    python -m app.rebuild_analytics
+"""
+from .database import SessionLocal, init_db
+from .services.analytics_service import AnalyticsService
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def main() -> None:
+    """Recompute every rollup table (backfill or repair)."""
+    init_db()
+    with SessionLocal() as db:
+        count = AnalyticsService.rebuild(db)
+    logger.info(f"Analytics rebuild complete: {count} plan(s)")
+
+
+if __name__ == "__main__":
+    main()
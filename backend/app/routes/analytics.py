@@ -0,0 +1,35 @@
+"""Analytics endpoints."""
+import logging
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import AnalyticsSummary
+from ..services.analytics_service import AnalyticsService
+from ..utils.rate_limit import rate_limit
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummary, dependencies=[Depends(rate_limit("read"))])
+async def get_analytics_summary(
+    start: Optional[datetime] = Query(None, description="Include plans created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Include plans created before this time"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get totals across all feature plans.
+
+    Returns task counts per category and priority, summed estimated effort
+    (in days) and risk severity distribution.
+    """
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    try:
+        return AnalyticsService.get_summary(db, start=start, end=end)
+    except Exception as e:
+        logger.error(f"Error computing analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,26 +1,46 @@
 """Routes for feature plan generation."""
+import asyncio
 import json
 import logging
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..config import get_settings
 from ..database import get_db
+from ..models import PlanVersion
 from ..schemas import (
     FeaturePlanRequest,
     FeaturePlanResponse,
     FeaturePlanUpdate,
     FeaturePlanListResponse,
+    SimilarPlanResponse,
+    PlanVersionInfo,
+    PlanVersionResponse,
+    PlanVersionDiff,
     EngineeringTask,
     UserStory,
 )
 from ..services.feature_service import FeatureService
+from ..services.version_service import VersionService
+from ..utils.event_bus import get_event_bus
+from ..utils.rate_limit import admit_generation, rate_limit
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/api/features", tags=["features"])
 
+generate_limit = Depends(rate_limit("generate"))
+read_limit = Depends(rate_limit("read"))
+write_limit = Depends(rate_limit("write"))
 
-@router.post("/generate", response_model=FeaturePlanResponse)
+
+@router.post(
+    "/generate",
+    response_model=FeaturePlanResponse,
+    dependencies=[generate_limit, Depends(admit_generation)]
+)
 async def generate_feature_plan(
     request: FeaturePlanRequest,
     db: Session = Depends(get_db)
@@ -34,7 +54,8 @@ async def generate_feature_plan(
     - Risks and mitigations
     """
     try:
-        plan = FeatureService.generate_plan(
+        # The blocking LLM call runs off the event loop; DB work does not
+        plan = await FeatureService.generate_plan_async(
             goal=request.goal,
             users=request.users,
             constraints=request.constraints,
@@ -57,7 +78,8 @@ async def generate_feature_plan(
                 for category, tasks in json.loads(plan.engineering_tasks).items()
             },
             risks=json.loads(plan.risks),
-            created_at=plan.created_at
+            created_at=plan.created_at,
+            updated_at=plan.updated_at
         )
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -70,7 +92,7 @@ async def generate_feature_plan(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/recent", response_model=list[FeaturePlanListResponse])
+@router.get("/recent", response_model=list[FeaturePlanListResponse], dependencies=[read_limit])
 async def get_recent_plans(
     limit: int = Query(5, ge=1, le=20),
     db: Session = Depends(get_db)
@@ -84,7 +106,88 @@ async def get_recent_plans(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/{plan_id}", response_model=FeaturePlanResponse)
+@router.get("/similar", response_model=list[SimilarPlanResponse], dependencies=[read_limit])
+async def get_similar_plans(
+    goal: str = Query(..., min_length=1, max_length=500),
+    users: list[str] = Query([]),
+    constraints: list[str] = Query([]),
+    limit: int = Query(5, ge=1, le=20),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    db: Session = Depends(get_db)
+):
+    """Find stored plans similar to a goal (with optional users and constraints)."""
+    try:
+        matches = FeatureService.find_similar_plans(
+            goal, users, constraints, db, limit=limit, min_score=min_score
+        )
+        return [
+            SimilarPlanResponse(
+                id=plan.id,
+                goal=plan.goal,
+                created_at=plan.created_at,
+                score=round(score, 4)
+            )
+            for plan, score in matches
+        ]
+    except Exception as e:
+        logger.error(f"Error finding similar plans: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _sse(event_id: str, event: dict) -> str:
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/events", dependencies=[read_limit])
+async def stream_plan_events(last_event_id: str = Header(None)):
+    """
+    Server-Sent Events stream of plan changes.
+
+    Events:
+    - plan_created: summary of a new plan (id, goal, created_at)
+    - plan_updated: structural patch of the plan's engineering tasks
+    - resync: events were missed; refetch the recent list and open plan
+    """
+    bus = get_event_bus()
+    if bus.subscriber_count >= settings.EVENT_MAX_SUBSCRIBERS:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many event subscribers",
+            headers={"Retry-After": str(int(settings.EVENT_HEARTBEAT_SECONDS))},
+        )
+    subscription, resync = bus.subscribe(last_event_id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            if resync:
+                subscription.drain()
+                yield _sse(bus.last_event_id, {"type": "resync"})
+            while True:
+                try:
+                    event_id, event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if subscription.lagged:
+                    # Queue overflowed; the client reloads instead of applying gaps
+                    subscription.drain()
+                    yield _sse(bus.last_event_id, {"type": "resync"})
+                    continue
+                yield _sse(event_id, event)
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{plan_id}", response_model=FeaturePlanResponse, dependencies=[read_limit])
 async def get_feature_plan(
     plan_id: int,
     db: Session = Depends(get_db)
@@ -110,7 +213,8 @@ async def get_feature_plan(
                 for category, tasks in json.loads(plan.engineering_tasks).items()
             },
             risks=json.loads(plan.risks),
-            created_at=plan.created_at
+            created_at=plan.created_at,
+            updated_at=plan.updated_at
         )
     except HTTPException:
         raise
@@ -119,7 +223,7 @@ async def get_feature_plan(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.put("/{plan_id}/tasks")
+@router.put("/{plan_id}/tasks", dependencies=[write_limit])
 async def update_plan_tasks(
     plan_id: int,
     request: FeaturePlanUpdate,
@@ -129,7 +233,10 @@ async def update_plan_tasks(
     try:
         plan = FeatureService.update_plan_tasks(
             plan_id=plan_id,
-            engineering_tasks=request.engineering_tasks,
+            engineering_tasks={
+                category: [task.model_dump() for task in tasks]
+                for category, tasks in request.engineering_tasks.items()
+            },
             db=db
         )
         if not plan:
@@ -146,7 +253,78 @@ async def update_plan_tasks(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/{plan_id}/export")
+@router.get("/{plan_id}/versions", response_model=list[PlanVersionInfo], dependencies=[read_limit])
+async def list_plan_versions(
+    plan_id: int,
+    db: Session = Depends(get_db)
+):
+    """List the saved versions of a plan's engineering tasks."""
+    try:
+        versions = VersionService.list_versions(plan_id, db)
+        if not versions and not FeatureService.get_plan_by_id(plan_id, db):
+            raise HTTPException(status_code=404, detail="Feature plan not found")
+        return versions
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing versions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{plan_id}/versions/diff", response_model=PlanVersionDiff, dependencies=[read_limit])
+async def diff_plan_versions(
+    plan_id: int,
+    from_version: int = Query(..., alias="from", ge=1),
+    to_version: int = Query(..., alias="to", ge=1),
+    db: Session = Depends(get_db)
+):
+    """Get a structural diff of engineering tasks between two versions."""
+    try:
+        result = VersionService.diff_versions(plan_id, from_version, to_version, db)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Plan version not found")
+        return PlanVersionDiff(
+            plan_id=plan_id,
+            from_version=from_version,
+            to_version=to_version,
+            patch=result["patch"]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error diffing versions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{plan_id}/versions/{version}", response_model=PlanVersionResponse, dependencies=[read_limit])
+async def get_plan_version(
+    plan_id: int,
+    version: int,
+    db: Session = Depends(get_db)
+):
+    """Get a plan's engineering tasks as of a specific version."""
+    try:
+        tasks = VersionService.get_version(plan_id, version, db)
+        if tasks is None:
+            raise HTTPException(status_code=404, detail="Plan version not found")
+        record = db.get(PlanVersion, (plan_id, version))
+        return PlanVersionResponse(
+            plan_id=plan_id,
+            version=version,
+            engineering_tasks={
+                category: [EngineeringTask(**task) for task in items]
+                for category, items in tasks.items()
+            },
+            created_at=record.created_at
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching version: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{plan_id}/export", dependencies=[read_limit])
 async def export_as_markdown(
     plan_id: int,
     db: Session = Depends(get_db)
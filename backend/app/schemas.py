@@ -53,6 +53,7 @@ class FeaturePlanResponse(BaseModel):
     engineering_tasks: dict[str, list[EngineeringTask]]  # grouped by category
     risks: list[dict]  # [{"risk": str, "mitigation": str}]
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -75,6 +76,67 @@ class FeaturePlanListResponse(BaseModel):
         from_attributes = True
 
 
+class PlanVersionInfo(BaseModel):
+    """Metadata of one stored plan version."""
+
+    version: int
+    is_snapshot: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PlanVersionResponse(BaseModel):
+    """Engineering tasks as of a plan version."""
+
+    plan_id: int
+    version: int
+    engineering_tasks: dict[str, list[EngineeringTask]]
+    created_at: datetime
+
+
+class PlanVersionDiff(BaseModel):
+    """Structural diff between two plan versions (see utils/json_diff.py)."""
+
+    plan_id: int
+    from_version: int
+    to_version: int
+    patch: Optional[dict]  # None when the versions are identical
+
+
+class SimilarPlanResponse(FeaturePlanListResponse):
+    """Stored plan similar to a requested goal."""
+
+    score: float  # cosine similarity, 0-1
+
+
+class TaskRollup(BaseModel):
+    """Task totals for one category and priority."""
+
+    category: str
+    priority: str
+    task_count: int
+    effort_min_days: float
+    effort_max_days: float
+
+
+class AnalyticsSummary(BaseModel):
+    """Totals across feature plans, optionally restricted to a date range."""
+
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    plan_count: int
+    task_count: int
+    effort_min_days: float
+    effort_max_days: float
+    unparsed_effort_count: int  # tasks whose estimated_effort could not be parsed
+    tasks: list[TaskRollup]
+    tasks_by_category: dict[str, int]
+    tasks_by_priority: dict[str, int]
+    risks_by_severity: dict[str, int]
+
+
 class HealthStatus(BaseModel):
     """Health check status."""
 
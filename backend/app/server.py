@@ -0,0 +1,77 @@
+"""
+Production server entry point with multi-worker support.
+
+Usage:
+    python -m app.server [--workers N] [--preload] [--host H] [--port P]
+
+A single worker runs uvicorn in-process. Several workers run under a
+gunicorn master with uvicorn workers (see ``app/gunicorn_conf.py``); with
+--preload the app is imported once in the master and workers are forked
+from it. The master creates the database schema before any worker starts,
+so workers never race on ``create_all``.
+"""
+import argparse
+import logging
+import os
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def reinit_after_fork() -> None:
+    """Recreate per-process resources that must not be shared across a fork."""
+    from .database import dispose_engine
+    from .utils.event_bus import set_event_bus
+    from .utils.llm import reset_client
+
+    dispose_engine()
+    reset_client()
+    set_event_bus(None)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Tasks Generator API")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY)
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        default=settings.PRELOAD_APP,
+        help="Load the app in a gunicorn master and fork workers from it",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the API with the configured number of workers."""
+    args = _parse_args()
+    workers = max(1, args.workers)
+
+    if workers > 1 or args.preload:
+        os.environ.update({
+            "HOST": args.host,
+            "PORT": str(args.port),
+            "WEB_CONCURRENCY": str(workers),
+            "PRELOAD_APP": str(args.preload),
+        })
+        os.execvp("gunicorn", [
+            "gunicorn", "-c", "python:app.gunicorn_conf", "app.main:app",
+        ])
+
+    import uvicorn
+
+    logger.info(f"Starting server on {args.host}:{args.port}")
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        log_level=settings.LOG_LEVEL.lower(),
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_SECONDS),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""Incrementally maintained analytics rollups across all feature plans."""
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from ..models import FeaturePlan, PlanRiskRollup, PlanTaskRollup, RiskTotal, TaskTotal
+from ..utils.effort import parse_effort
+from .archive_service import ArchiveService
+
+logger = logging.getLogger(__name__)
+
+_TASK_FIELDS = ("task_count", "effort_min_days", "effort_max_days", "unparsed_effort_count")
+
+
+def _label(value, default: str) -> str:
+    """Normalize a priority/severity label so "high" and "High" group together."""
+    text = str(value or "").strip()
+    return text.capitalize() if text else default
+
+
+def _task_groups(engineering_tasks: dict) -> dict[tuple[str, str], dict]:
+    """Aggregate tasks by (category, priority), parsing effort estimates once."""
+    groups = defaultdict(lambda: dict.fromkeys(_TASK_FIELDS, 0))
+    for category, tasks in (engineering_tasks or {}).items():
+        for task in tasks or []:
+            group = groups[(category, _label(task.get("priority"), "Medium"))]
+            group["task_count"] += 1
+            effort = parse_effort(task.get("estimated_effort"))
+            if effort is None:
+                group["unparsed_effort_count"] += 1
+            else:
+                group["effort_min_days"] += effort[0]
+                group["effort_max_days"] += effort[1]
+    return dict(groups)
+
+
+def _risk_groups(risks: list) -> dict[str, int]:
+    """Count risks by severity."""
+    groups = defaultdict(int)
+    for risk in risks or []:
+        groups[_label(risk.get("severity"), "Medium")] += 1
+    return dict(groups)
+
+
+class AnalyticsService:
+    """Service for maintaining and querying plan analytics."""
+
+    @staticmethod
+    def record_tasks(
+        plan_id: int,
+        plan_created_at: datetime,
+        engineering_tasks: dict,
+        db: Session
+    ) -> None:
+        """
+        Replace a plan's task rollups and apply the difference to the totals.
+
+        Does not commit; call within the transaction that writes the plan.
+        """
+        old_rows = db.query(PlanTaskRollup).filter(PlanTaskRollup.plan_id == plan_id).all()
+        old = {
+            (row.category, row.priority): {field: getattr(row, field) for field in _TASK_FIELDS}
+            for row in old_rows
+        }
+        new = _task_groups(engineering_tasks)
+
+        for row in old_rows:
+            db.delete(row)
+        db.flush()
+        for (category, priority), values in new.items():
+            db.add(PlanTaskRollup(
+                plan_id=plan_id,
+                category=category,
+                priority=priority,
+                plan_created_at=plan_created_at,
+                **values
+            ))
+
+        zero = dict.fromkeys(_TASK_FIELDS, 0)
+        for key in set(old) | set(new):
+            delta = {
+                field: new.get(key, zero)[field] - old.get(key, zero)[field]
+                for field in _TASK_FIELDS
+            }
+            if not any(delta.values()):
+                continue
+            category, priority = key
+            result = db.execute(
+                update(TaskTotal)
+                .where(TaskTotal.category == category, TaskTotal.priority == priority)
+                .values({getattr(TaskTotal, f): getattr(TaskTotal, f) + d for f, d in delta.items()})
+            )
+            if result.rowcount == 0:
+                db.add(TaskTotal(category=category, priority=priority, **delta))
+        db.flush()
+
+    @staticmethod
+    def record_risks(
+        plan_id: int,
+        plan_created_at: datetime,
+        risks: list,
+        db: Session
+    ) -> None:
+        """Replace a plan's risk rollups and apply the difference to the totals."""
+        old_rows = db.query(PlanRiskRollup).filter(PlanRiskRollup.plan_id == plan_id).all()
+        old = {row.severity: row.risk_count for row in old_rows}
+        new = _risk_groups(risks)
+
+        for row in old_rows:
+            db.delete(row)
+        db.flush()
+        for severity, count in new.items():
+            db.add(PlanRiskRollup(
+                plan_id=plan_id,
+                severity=severity,
+                risk_count=count,
+                plan_created_at=plan_created_at
+            ))
+
+        for severity in set(old) | set(new):
+            delta = new.get(severity, 0) - old.get(severity, 0)
+            if not delta:
+                continue
+            result = db.execute(
+                update(RiskTotal)
+                .where(RiskTotal.severity == severity)
+                .values(risk_count=RiskTotal.risk_count + delta)
+            )
+            if result.rowcount == 0:
+                db.add(RiskTotal(severity=severity, risk_count=delta))
+        db.flush()
+
+    @staticmethod
+    def record_plan(plan: FeaturePlan, engineering_tasks: dict, risks: list, db: Session) -> None:
+        """Record rollups for a newly created plan (must already be flushed)."""
+        AnalyticsService.record_tasks(plan.id, plan.created_at, engineering_tasks, db)
+        AnalyticsService.record_risks(plan.id, plan.created_at, risks, db)
+
+    @staticmethod
+    def get_summary(
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> dict:
+        """
+        Summarize tasks, effort and risks across plans.
+
+        Without a date range the incrementally maintained totals are read
+        directly; with one, per-plan rollups in the range are aggregated.
+        """
+        plans = db.query(func.count(FeaturePlan.id))
+        if start is not None:
+            plans = plans.filter(FeaturePlan.created_at >= start)
+        if end is not None:
+            plans = plans.filter(FeaturePlan.created_at < end)
+
+        if start is None and end is None:
+            task_rows = [
+                ((row.category, row.priority), [getattr(row, f) for f in _TASK_FIELDS])
+                for row in db.query(TaskTotal).filter(TaskTotal.task_count > 0)
+            ]
+            risk_rows = [
+                (row.severity, row.risk_count)
+                for row in db.query(RiskTotal).filter(RiskTotal.risk_count > 0)
+            ]
+        else:
+            task_rows, risk_rows = AnalyticsService._aggregate_range(db, start, end)
+
+        return AnalyticsService._build_summary(plans.scalar() or 0, task_rows, risk_rows, start, end)
+
+    @staticmethod
+    def _aggregate_range(
+        db: Session,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> tuple[list, list]:
+        """Group per-plan rollups in a date range with vectorized NumPy sums."""
+        import numpy as np
+
+        def in_range(query, column):
+            if start is not None:
+                query = query.filter(column >= start)
+            if end is not None:
+                query = query.filter(column < end)
+            return query
+
+        tasks = in_range(db.query(
+            PlanTaskRollup.category,
+            PlanTaskRollup.priority,
+            *[getattr(PlanTaskRollup, f) for f in _TASK_FIELDS]
+        ), PlanTaskRollup.plan_created_at).all()
+        risks = in_range(
+            db.query(PlanRiskRollup.severity, PlanRiskRollup.risk_count),
+            PlanRiskRollup.plan_created_at
+        ).all()
+
+        task_rows = []
+        if tasks:
+            keys = np.array([f"{row[0]}\x1f{row[1]}" for row in tasks])
+            values = np.array([row[2:] for row in tasks], dtype=np.float64)
+            groups, inverse = np.unique(keys, return_inverse=True)
+            sums = np.zeros((len(groups), values.shape[1]))
+            np.add.at(sums, inverse, values)
+            task_rows = [
+                (tuple(str(key).split("\x1f", 1)), list(total))
+                for key, total in zip(groups, sums)
+            ]
+
+        risk_rows = []
+        if risks:
+            severities, inverse = np.unique(np.array([row[0] for row in risks]), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.array([row[1] for row in risks], dtype=np.float64))
+            risk_rows = list(zip(severities.tolist(), counts.tolist()))
+
+        return task_rows, risk_rows
+
+    @staticmethod
+    def _build_summary(
+        plan_count: int,
+        task_rows: list,
+        risk_rows: list,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> dict:
+        tasks = []
+        by_category = defaultdict(int)
+        by_priority = defaultdict(int)
+        totals = dict.fromkeys(_TASK_FIELDS, 0.0)
+        for (category, priority), values in sorted(task_rows):
+            row = dict(zip(_TASK_FIELDS, values))
+            tasks.append({
+                "category": category,
+                "priority": priority,
+                "task_count": int(row["task_count"]),
+                "effort_min_days": round(float(row["effort_min_days"]), 3),
+                "effort_max_days": round(float(row["effort_max_days"]), 3),
+            })
+            by_category[category] += int(row["task_count"])
+            by_priority[priority] += int(row["task_count"])
+            for field in _TASK_FIELDS:
+                totals[field] += float(row[field])
+
+        return {
+            "start": start,
+            "end": end,
+            "plan_count": plan_count,
+            "task_count": int(totals["task_count"]),
+            "effort_min_days": round(totals["effort_min_days"], 3),
+            "effort_max_days": round(totals["effort_max_days"], 3),
+            "unparsed_effort_count": int(totals["unparsed_effort_count"]),
+            "tasks": tasks,
+            "tasks_by_category": dict(by_category),
+            "tasks_by_priority": dict(by_priority),
+            "risks_by_severity": {severity: int(count) for severity, count in sorted(risk_rows)},
+        }
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 500) -> int:
+        """
+        Recompute all rollups and totals from the stored plans.
+
+        Returns:
+            Number of plans processed
+        """
+        for model in (PlanTaskRollup, PlanRiskRollup, TaskTotal, RiskTotal):
+            db.query(model).delete()
+        db.flush()
+
+        count = 0
+        last_id = 0
+        while True:
+            batch = (
+                db.query(FeaturePlan)
+                .filter(FeaturePlan.id > last_id)
+                .order_by(FeaturePlan.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            for plan in batch:
+                ArchiveService.hydrate(plan, db)
+                AnalyticsService.record_plan(
+                    plan, json.loads(plan.engineering_tasks), json.loads(plan.risks), db
+                )
+            count += len(batch)
+            last_id = batch[-1].id
+        db.commit()
+        logger.info(f"Rebuilt analytics rollups for {count} plan(s)")
+        return count
@@ -0,0 +1,233 @@
+"""Compressed cold-tier storage for old feature plans."""
+import json
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from ..config import get_settings
+from ..models import FeaturePlan, PlanArchive
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Payload columns moved to the archive; users/constraints stay hot for search
+ARCHIVED_COLUMNS = ("user_stories", "engineering_tasks", "risks")
+# Value left in the hot table's payload columns once a plan is archived
+ARCHIVED_PAYLOAD = ""
+
+# Preset dictionary of strings common to every plan. Plans are small, so
+# priming zlib with it noticeably improves the ratio. Never edit in place:
+# add a new version and keep the old one for decompression.
+_ZDICTS = {
+    1: (
+        '{"user_stories": [{"title": "", "description": "As a user, I want to '
+        'so that I can ", "acceptance_criteria": ["System provides appropriate '
+        'feedback"]}], "engineering_tasks": {"Frontend": [{"id": "FE-001", '
+        '"title": "", "description": "Implement ", "category": "Frontend", '
+        '"priority": "High", "estimated_effort": "2-3 days", "order": 1}], '
+        '"Backend": [{"id": "BE-001", "category": "Backend", "priority": '
+        '"Medium", "estimated_effort": "1 day"}], "Database": [{"id": "DB-001", '
+        '"category": "Database", "priority": "Low"}], "Infrastructure": '
+        '[{"id": "INF-001", "category": "Infrastructure"}]}, "risks": '
+        '[{"risk": "", "mitigation": "", "severity": "High"}, {"severity": '
+        '"Medium"}, {"severity": "Low"}]}'
+    ).encode("utf-8"),
+}
+_CURRENT_ZDICT = 1
+
+
+def compress_payload(payload: dict) -> bytes:
+    """Compress plan payload columns; the first byte records the dictionary version."""
+    compressor = zlib.compressobj(level=9, zdict=_ZDICTS[_CURRENT_ZDICT])
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return bytes([_CURRENT_ZDICT]) + compressor.compress(data) + compressor.flush()
+
+
+def decompress_payload(blob: bytes) -> dict:
+    """Inverse of compress_payload."""
+    decompressor = zlib.decompressobj(zdict=_ZDICTS[blob[0]])
+    data = decompressor.decompress(blob[1:]) + decompressor.flush()
+    return json.loads(data)
+
+
+class _LRUCache:
+    """Small thread-safe LRU of decompressed payloads."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: tuple, value: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_payload_cache = _LRUCache(settings.ARCHIVE_LRU_SIZE)
+
+
+class ArchiveService:
+    """Service for moving old plans to compressed storage and back."""
+
+    @staticmethod
+    def is_archived(plan: FeaturePlan) -> bool:
+        """Whether the plan's payload lives in the archive table."""
+        return plan.engineering_tasks == ARCHIVED_PAYLOAD
+
+    @staticmethod
+    def _load_payload(plan: FeaturePlan, db: Session) -> Optional[dict]:
+        # Editing thaws a plan and bumps updated_at while archiving keeps it,
+        # so the key changes whenever the archived content can
+        key = (plan.id, plan.updated_at)
+        payload = _payload_cache.get(key)
+        if payload is None:
+            archive = db.get(PlanArchive, plan.id)
+            if archive is None:
+                return None
+            payload = decompress_payload(archive.payload)
+            _payload_cache.put(key, payload)
+        return payload
+
+    @staticmethod
+    def hydrate(plan: Optional[FeaturePlan], db: Session) -> Optional[FeaturePlan]:
+        """
+        Fill an archived plan's payload columns from the archive.
+
+        Values are set as already-committed state, so reading an archived
+        plan never writes it back to the hot table.
+        """
+        if plan is None or not ArchiveService.is_archived(plan):
+            return plan
+        payload = ArchiveService._load_payload(plan, db)
+        if payload is None:
+            logger.error(f"Archived payload missing for plan {plan.id}")
+            return plan
+        for column in ARCHIVED_COLUMNS:
+            set_committed_value(plan, column, payload[column])
+        return plan
+
+    @staticmethod
+    def thaw(plan: FeaturePlan, db: Session) -> None:
+        """
+        Move an archived plan back to the hot table before it is edited.
+
+        Does not commit; call within the transaction that edits the plan.
+        """
+        # The plan may already be hydrated, so ask the archive table
+        archive = db.get(PlanArchive, plan.id)
+        if archive is None:
+            return
+        payload = decompress_payload(archive.payload)
+        for column in ARCHIVED_COLUMNS:
+            setattr(plan, column, payload[column])
+            # May equal the hydrated committed value; force the write anyway
+            flag_modified(plan, column)
+        db.delete(archive)
+        logger.info(f"Plan {plan.id} moved back from archive")
+
+    @staticmethod
+    def archive_old_plans(
+        db: Session,
+        older_than_days: Optional[int] = None,
+        batch_size: int = 200
+    ) -> int:
+        """
+        Compress payloads of plans not updated for ``older_than_days``.
+
+        Returns:
+            Number of plans archived
+        """
+        days = older_than_days if older_than_days is not None else settings.ARCHIVE_AFTER_DAYS
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        count = 0
+        raw_bytes = 0
+        compressed_bytes = 0
+        # Page by id so rows skipped below are not selected again
+        last_id = 0
+
+        while True:
+            batch = (
+                db.query(
+                    FeaturePlan.id,
+                    FeaturePlan.updated_at,
+                    *[getattr(FeaturePlan, c) for c in ARCHIVED_COLUMNS]
+                )
+                .filter(
+                    FeaturePlan.id > last_id,
+                    FeaturePlan.engineering_tasks != ARCHIVED_PAYLOAD,
+                    FeaturePlan.updated_at < cutoff
+                )
+                .order_by(FeaturePlan.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            for plan_id, updated_at, *values in batch:
+                # Archiving is not an edit, so keep updated_at as it was. Only
+                # archive the row as selected: a plan edited or archived since
+                # then is left alone rather than overwritten with stale content
+                result = db.execute(
+                    update(FeaturePlan)
+                    .where(
+                        FeaturePlan.id == plan_id,
+                        FeaturePlan.updated_at == updated_at,
+                        FeaturePlan.engineering_tasks != ARCHIVED_PAYLOAD
+                    )
+                    .values(
+                        updated_at=FeaturePlan.updated_at,
+                        **dict.fromkeys(ARCHIVED_COLUMNS, ARCHIVED_PAYLOAD)
+                    )
+                )
+                if result.rowcount == 0:
+                    continue
+                payload = dict(zip(ARCHIVED_COLUMNS, values))
+                blob = compress_payload(payload)
+                raw = sum(len(value.encode("utf-8")) for value in values)
+                db.merge(PlanArchive(
+                    plan_id=plan_id,
+                    payload=blob,
+                    raw_size=raw,
+                    compressed_size=len(blob),
+                    archived_at=datetime.utcnow()
+                ))
+                count += 1
+                raw_bytes += raw
+                compressed_bytes += len(blob)
+            db.commit()
+
+        if count:
+            logger.info(
+                f"Archived {count} plan(s): {raw_bytes} -> {compressed_bytes} bytes "
+                f"({compressed_bytes / raw_bytes:.1%})"
+            )
+        return count
+
+
+def clear_payload_cache() -> None:
+    """Drop all decompressed payloads from the LRU."""
+    _payload_cache.clear()
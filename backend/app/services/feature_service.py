@@ -2,13 +2,22 @@
 import json
 import logging
 from typing import Optional
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..models import FeaturePlan
 from ..schemas import EngineeringTask, UserStory
-from ..utils.llm import generate_feature_plan
+from ..config import get_settings
+from ..utils.event_bus import publish_event
+from ..utils.json_diff import diff
+from ..utils.llm import generate_feature_plan, generate_feature_plan_sectioned
 from ..utils.validators import validate_feature_plan_input
+from .analytics_service import AnalyticsService
+from .archive_service import ArchiveService
+from .plan_index import plan_index
+from .version_service import VersionService
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class FeatureService:
@@ -19,10 +28,57 @@ class FeatureService:
         goal: str,
         users: list[str],
         constraints: list[str],
-        db: Session
+        db: Session,
+        sectioned: Optional[bool] = None
     ) -> Optional[FeaturePlan]:
-        """Generate a new feature plan."""
-        # Validate input
+        """
+        Generate a new feature plan.
+
+        When sectioned (defaults to PLAN_GENERATION_MODE), stories, each task
+        category and risks are generated by concurrent smaller prompts.
+        """
+        existing, reference = FeatureService._prepare_generation(goal, users, constraints, db)
+        if existing:
+            return existing
+        plan_data = FeatureService.request_plan_data(goal, users, constraints, sectioned, reference)
+        return FeatureService._save_plan(goal, users, constraints, plan_data, db)
+
+    @staticmethod
+    async def generate_plan_async(
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        db: Session,
+        sectioned: Optional[bool] = None
+    ) -> Optional[FeaturePlan]:
+        """
+        Same as generate_plan, with only the blocking LLM call in the threadpool.
+
+        Database work stays on the caller's thread: the SQLite engine shares
+        one connection, so sessions must not be used from worker threads.
+        """
+        existing, reference = FeatureService._prepare_generation(goal, users, constraints, db)
+        if existing:
+            return existing
+        plan_data = await run_in_threadpool(
+            FeatureService.request_plan_data, goal, users, constraints, sectioned, reference
+        )
+        return FeatureService._save_plan(goal, users, constraints, plan_data, db)
+
+    @staticmethod
+    def _prepare_generation(
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        db: Session
+    ) -> tuple[Optional[FeaturePlan], Optional[dict]]:
+        """
+        Validate input and look for a near-duplicate plan, if enabled.
+
+        Returns:
+            Tuple of (plan to return instead of generating, plan data to
+            pass to the LLM as a reference); at most one is set
+        """
         is_valid, error_msg = validate_feature_plan_input(goal, users, constraints)
         if not is_valid:
             logger.error(f"Validation error: {error_msg}")
@@ -30,26 +86,85 @@ class FeatureService:
 
         logger.info(f"Generating feature plan for goal: {goal}")
 
-        # Call LLM
-        plan_data = generate_feature_plan(goal, users, constraints)
+        # Reuse a near-duplicate plan, or seed the LLM prompt with it
+        if settings.SIMILAR_PLAN_REUSE in ("return", "seed"):
+            similar = FeatureService.find_similar_plans(
+                goal, users, constraints, db,
+                limit=1, min_score=settings.SIMILAR_PLAN_THRESHOLD
+            )
+            if similar:
+                existing, score = similar[0]
+                logger.info(f"Found similar plan {existing.id} (score {score:.3f})")
+                existing = ArchiveService.hydrate(existing, db)
+                if settings.SIMILAR_PLAN_REUSE == "return":
+                    return existing, None
+                return None, {
+                    "user_stories": json.loads(existing.user_stories),
+                    "engineering_tasks": json.loads(existing.engineering_tasks),
+                    "risks": json.loads(existing.risks),
+                }
+        return None, None
+
+    @staticmethod
+    def request_plan_data(
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        sectioned: Optional[bool] = None,
+        reference: Optional[dict] = None
+    ) -> dict:
+        """
+        Call the LLM for plan data. Blocking; does no database work.
+
+        ``reference`` is a similar stored plan for the model to adapt.
+        """
+        if sectioned is None:
+            sectioned = settings.PLAN_GENERATION_MODE == "sectioned"
+        if sectioned:
+            plan_data = generate_feature_plan_sectioned(goal, users, constraints, reference=reference)
+        else:
+            plan_data = generate_feature_plan(goal, users, constraints, reference=reference)
         if not plan_data:
             logger.error("LLM failed to generate plan")
             raise RuntimeError("Failed to generate feature plan from LLM")
+        return plan_data
 
-        # Create database record
+    @staticmethod
+    def _save_plan(
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        plan_data: dict,
+        db: Session
+    ) -> FeaturePlan:
+        """Create the database record for generated plan data."""
+        engineering_tasks = plan_data.get("engineering_tasks", {})
+        risks = plan_data.get("risks", [])
         try:
             feature_plan = FeaturePlan(
                 goal=goal,
                 users=json.dumps(users),
                 constraints=json.dumps(constraints),
                 user_stories=json.dumps(plan_data.get("user_stories", [])),
-                engineering_tasks=json.dumps(plan_data.get("engineering_tasks", {})),
-                risks=json.dumps(plan_data.get("risks", []))
+                engineering_tasks=json.dumps(engineering_tasks),
+                risks=json.dumps(risks)
             )
             db.add(feature_plan)
+            db.flush()
+            AnalyticsService.record_plan(feature_plan, engineering_tasks, risks, db)
+            VersionService.record_initial(feature_plan.id, engineering_tasks, db)
             db.commit()
             db.refresh(feature_plan)
             logger.info(f"Feature plan created with id: {feature_plan.id}")
+            plan_index.add_plan(feature_plan)
+            publish_event(
+                "plan_created",
+                plan={
+                    "id": feature_plan.id,
+                    "goal": feature_plan.goal,
+                    "created_at": feature_plan.created_at.isoformat(),
+                }
+            )
             return feature_plan
         except Exception as e:
             db.rollback()
@@ -61,10 +176,39 @@ class FeatureService:
         """Get recent feature plans."""
         return db.query(FeaturePlan).order_by(FeaturePlan.created_at.desc()).limit(limit).all()
 
+    @staticmethod
+    def find_similar_plans(
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        db: Session,
+        limit: int = 5,
+        min_score: float = 0.0,
+        exclude_id: Optional[int] = None
+    ) -> list[tuple[FeaturePlan, float]]:
+        """
+        Find stored plans whose goal, users and constraints are most similar.
+
+        Archived plans are not hydrated; call ArchiveService.hydrate before
+        reading a match's payload columns.
+        """
+        matches = plan_index.search(
+            db, goal, users, constraints,
+            limit=limit, min_score=min_score, exclude_id=exclude_id
+        )
+        if not matches:
+            return []
+        plans = {
+            plan.id: plan
+            for plan in db.query(FeaturePlan).filter(FeaturePlan.id.in_([m[0] for m in matches]))
+        }
+        return [(plans[plan_id], score) for plan_id, score in matches if plan_id in plans]
+
     @staticmethod
     def get_plan_by_id(plan_id: int, db: Session) -> Optional[FeaturePlan]:
-        """Get a specific feature plan."""
-        return db.query(FeaturePlan).filter(FeaturePlan.id == plan_id).first()
+        """Get a specific feature plan, decompressing it if archived."""
+        plan = db.query(FeaturePlan).filter(FeaturePlan.id == plan_id).first()
+        return ArchiveService.hydrate(plan, db)
 
     @staticmethod
     def update_plan_tasks(
@@ -79,10 +223,25 @@ class FeatureService:
             return None
 
         try:
+            ArchiveService.thaw(plan, db)
+            previous_updated_at = plan.updated_at
+            old_tasks = json.loads(plan.engineering_tasks)
+            patch = diff(old_tasks, engineering_tasks)
+            version = VersionService.record_update(plan.id, old_tasks, engineering_tasks, db, patch=patch)
             plan.engineering_tasks = json.dumps(engineering_tasks)
+            AnalyticsService.record_tasks(plan.id, plan.created_at, engineering_tasks, db)
             db.commit()
             db.refresh(plan)
-            logger.info(f"Plan {plan_id} updated successfully")
+            logger.info(f"Plan {plan_id} updated successfully (version {version or 'unchanged'})")
+            if patch is not None:
+                publish_event(
+                    "plan_updated",
+                    plan_id=plan.id,
+                    version=version,
+                    previous_updated_at=previous_updated_at.isoformat(),
+                    updated_at=plan.updated_at.isoformat(),
+                    patch={"engineering_tasks": patch}
+                )
             return plan
         except Exception as e:
             db.rollback()
@@ -0,0 +1,165 @@
+"""Embedding similarity index over stored feature plans."""
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import FeaturePlan
+from ..utils.embeddings import embed_text
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def embed_plan_request(goal: str, users: list[str], constraints: list[str]) -> "np.ndarray":
+    """Embed a plan request; the goal is weighted above users and constraints."""
+    import numpy as np
+
+    vector = 2.0 * embed_text(goal)
+    if users:
+        vector = vector + embed_text(" ".join(users))
+    if constraints:
+        vector = vector + embed_text(" ".join(constraints))
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).astype(np.float32)
+
+
+class PlanSimilarityIndex:
+    """
+    In-memory nearest-neighbor index of plan embeddings.
+
+    Vectors live in one preallocated matrix that grows geometrically, so a
+    search is a single matrix-vector product. The index is built lazily from
+    the database and catches up with rows written by other processes by
+    indexing any plan id above the highest one it has seen.
+    """
+
+    def __init__(self, initial_capacity: int = 256):
+        self._lock = threading.Lock()
+        self._initial_capacity = initial_capacity
+        self._ids: Optional["np.ndarray"] = None
+        self._matrix: Optional["np.ndarray"] = None
+        self._size = 0
+        self._max_id = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, plan_id: int, goal: str, users: list[str], constraints: list[str]) -> None:
+        """Add or replace a plan's embedding."""
+        vector = embed_plan_request(goal, users, constraints)
+        with self._lock:
+            self._add_locked(plan_id, vector)
+            # Advance only when no lower id can still be missing (e.g. one
+            # written by another worker), or sync would never fetch it
+            if plan_id == self._max_id + 1:
+                self._max_id = plan_id
+
+    def add_plan(self, plan: FeaturePlan) -> None:
+        """Add a stored plan to the index."""
+        self.add(plan.id, plan.goal, json.loads(plan.users), json.loads(plan.constraints))
+
+    def remove(self, plan_id: int) -> None:
+        """Remove a plan from the index."""
+        import numpy as np
+
+        with self._lock:
+            if self._size == 0:
+                return
+            matches = np.nonzero(self._ids[:self._size] == plan_id)[0]
+            for idx in sorted(matches, reverse=True):
+                last = self._size - 1
+                self._ids[idx] = self._ids[last]
+                self._matrix[idx] = self._matrix[last]
+                self._size = last
+
+    def sync(self, db: Session) -> None:
+        """Index plans written since the last sync (including by other workers)."""
+        rows = (
+            db.query(FeaturePlan.id, FeaturePlan.goal, FeaturePlan.users, FeaturePlan.constraints)
+            .filter(FeaturePlan.id > self._max_id)
+            .order_by(FeaturePlan.id)
+            .all()
+        )
+        if not rows:
+            return
+        with self._lock:
+            indexed = set(self._ids[:self._size].tolist()) if self._size else set()
+        # Plans added directly after a gap in the ids are already embedded
+        vectors = [
+            (row.id, embed_plan_request(row.goal, json.loads(row.users), json.loads(row.constraints)))
+            for row in rows
+            if row.id not in indexed
+        ]
+        with self._lock:
+            for plan_id, vector in vectors:
+                self._add_locked(plan_id, vector)
+            self._max_id = max(self._max_id, rows[-1].id)
+        if vectors:
+            logger.info(f"Indexed {len(vectors)} plan(s) for similarity search")
+
+    def search(
+        self,
+        db: Session,
+        goal: str,
+        users: Optional[list[str]] = None,
+        constraints: Optional[list[str]] = None,
+        limit: int = 5,
+        min_score: float = 0.0,
+        exclude_id: Optional[int] = None
+    ) -> list[tuple[int, float]]:
+        """
+        Find the most similar stored plans.
+
+        Returns:
+            List of (plan_id, cosine similarity) sorted by descending similarity
+        """
+        import numpy as np
+
+        self.sync(db)
+        query = embed_plan_request(goal, users or [], constraints or [])
+        with self._lock:
+            if self._size == 0:
+                return []
+            scores = self._matrix[:self._size] @ query
+            ids = self._ids[:self._size].copy()
+
+        if exclude_id is not None:
+            scores = np.where(ids == exclude_id, -np.inf, scores)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(ids[i]), float(scores[i]))
+            for i in top
+            if np.isfinite(scores[i]) and scores[i] >= min_score
+        ]
+
+    def _add_locked(self, plan_id: int, vector: "np.ndarray") -> None:
+        import numpy as np
+
+        if self._size:
+            existing = np.nonzero(self._ids[:self._size] == plan_id)[0]
+            if len(existing):
+                self._matrix[existing[0]] = vector
+                return
+
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            self._matrix = np.zeros((self._initial_capacity, vector.shape[0]), dtype=np.float32)
+            self._ids = np.zeros(self._initial_capacity, dtype=np.int64)
+            self._size = 0
+        elif self._size == len(self._ids):
+            capacity = len(self._ids) * 2
+            self._matrix = np.resize(self._matrix, (capacity, self._matrix.shape[1]))
+            self._ids = np.resize(self._ids, capacity)
+
+        self._matrix[self._size] = vector
+        self._ids[self._size] = plan_id
+        self._size += 1
+
+
+plan_index = PlanSimilarityIndex()
@@ -0,0 +1,158 @@
+"""Delta-based version history for plan task edits."""
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import PlanVersion
+from ..utils.json_diff import apply_patch, diff
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class VersionService:
+    """Service for storing and reconstructing plan versions."""
+
+    @staticmethod
+    def _latest_version(plan_id: int, db: Session) -> int:
+        return db.query(func.max(PlanVersion.version)).filter(
+            PlanVersion.plan_id == plan_id
+        ).scalar() or 0
+
+    @staticmethod
+    def record_initial(plan_id: int, engineering_tasks: dict, db: Session) -> None:
+        """Store version 1 of a new plan as a snapshot. Does not commit."""
+        db.add(PlanVersion(
+            plan_id=plan_id,
+            version=1,
+            is_snapshot=True,
+            payload=json.dumps(engineering_tasks)
+        ))
+
+    @staticmethod
+    def record_update(
+        plan_id: int,
+        old_tasks: dict,
+        new_tasks: dict,
+        db: Session,
+        patch: Optional[dict] = None
+    ) -> Optional[int]:
+        """
+        Store a new version for a task edit. Does not commit.
+
+        ``patch`` may pass an already computed ``diff(old_tasks, new_tasks)``.
+
+        Every PLAN_SNAPSHOT_INTERVAL versions a full snapshot is written so
+        reconstructing any version applies a bounded number of diffs.
+
+        Returns:
+            The new version number, or None if nothing changed
+        """
+        if patch is None:
+            patch = diff(old_tasks, new_tasks)
+        if patch is None:
+            return None
+
+        latest = VersionService._latest_version(plan_id, db)
+        if latest == 0:
+            # Plan predates version history: record its current tasks first
+            VersionService.record_initial(plan_id, old_tasks, db)
+            latest = 1
+
+        version = latest + 1
+        is_snapshot = (version - 1) % settings.PLAN_SNAPSHOT_INTERVAL == 0
+        db.add(PlanVersion(
+            plan_id=plan_id,
+            version=version,
+            is_snapshot=is_snapshot,
+            payload=json.dumps(new_tasks if is_snapshot else patch)
+        ))
+        return version
+
+    @staticmethod
+    def list_versions(plan_id: int, db: Session) -> list[PlanVersion]:
+        """List a plan's versions, oldest first."""
+        return db.query(PlanVersion).filter(
+            PlanVersion.plan_id == plan_id
+        ).order_by(PlanVersion.version).all()
+
+    @staticmethod
+    def get_version(plan_id: int, version: int, db: Session) -> Optional[dict]:
+        """Reconstruct the engineering tasks of a version, or None if unknown."""
+        snapshot = db.query(PlanVersion).filter(
+            PlanVersion.plan_id == plan_id,
+            PlanVersion.version <= version,
+            PlanVersion.is_snapshot.is_(True)
+        ).order_by(PlanVersion.version.desc()).first()
+        if snapshot is None:
+            return None
+
+        deltas = db.query(PlanVersion).filter(
+            PlanVersion.plan_id == plan_id,
+            PlanVersion.version > snapshot.version,
+            PlanVersion.version <= version
+        ).order_by(PlanVersion.version).all()
+        if snapshot.version + len(deltas) != version:
+            return None
+
+        tasks = json.loads(snapshot.payload)
+        for delta in deltas:
+            tasks = json.loads(delta.payload) if delta.is_snapshot else apply_patch(tasks, json.loads(delta.payload))
+        return tasks
+
+    @staticmethod
+    def diff_versions(plan_id: int, from_version: int, to_version: int, db: Session) -> Optional[dict]:
+        """
+        Structural diff between two versions.
+
+        Returns:
+            Dict with the patch, or None if either version is unknown
+        """
+        old = VersionService.get_version(plan_id, from_version, db)
+        new = VersionService.get_version(plan_id, to_version, db)
+        if old is None or new is None:
+            return None
+        return {"patch": diff(old, new)}
+
+    @staticmethod
+    def compact(db: Session, retention: Optional[int] = None) -> int:
+        """
+        Bound history storage by dropping versions beyond the retention window.
+
+        For each plan with more than ``retention`` versions, the oldest kept
+        version is rewritten as a snapshot and older versions are deleted.
+
+        Returns:
+            Number of version rows deleted
+        """
+        retention = retention or settings.PLAN_VERSION_RETENTION
+        plans = db.query(
+            PlanVersion.plan_id,
+            func.min(PlanVersion.version),
+            func.max(PlanVersion.version)
+        ).group_by(PlanVersion.plan_id).having(
+            func.max(PlanVersion.version) - func.min(PlanVersion.version) + 1 > retention
+        ).all()
+
+        deleted = 0
+        for plan_id, _, latest in plans:
+            cutoff = latest - retention + 1
+            tasks = VersionService.get_version(plan_id, cutoff, db)
+            if tasks is None:
+                logger.error(f"Cannot reconstruct version {cutoff} of plan {plan_id}; skipping")
+                continue
+            kept = db.get(PlanVersion, (plan_id, cutoff))
+            kept.is_snapshot = True
+            kept.payload = json.dumps(tasks)
+            deleted += db.query(PlanVersion).filter(
+                PlanVersion.plan_id == plan_id,
+                PlanVersion.version < cutoff
+            ).delete()
+            db.commit()
+
+        logger.info(f"Compacted version history of {len(plans)} plan(s), deleted {deleted} row(s)")
+        return deleted
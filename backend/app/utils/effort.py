@@ -0,0 +1,46 @@
+"""Parsing of free-text effort estimates into numeric day ranges."""
+import re
+from typing import Optional
+
+# Working days per unit
+_UNIT_DAYS = {
+    "hour": 1 / 8,
+    "hr": 1 / 8,
+    "h": 1 / 8,
+    "day": 1.0,
+    "d": 1.0,
+    "week": 5.0,
+    "wk": 5.0,
+    "w": 5.0,
+    "sprint": 10.0,
+    "month": 20.0,
+}
+
+_EFFORT_RE = re.compile(
+    r"(?P<low>\d+(?:\.\d+)?)\s*(?:(?:-|–|to)\s*(?P<high>\d+(?:\.\d+)?))?\s*(?P<unit>[a-z]+)?"
+)
+
+
+def parse_effort(effort: Optional[str]) -> Optional[tuple[float, float]]:
+    """
+    Parse an effort estimate such as "2-3 days", "1 week" or "4h".
+
+    Returns:
+        Tuple of (min_days, max_days), or None if the text is not understood
+    """
+    if not effort:
+        return None
+    match = _EFFORT_RE.search(effort.lower())
+    if not match:
+        return None
+
+    unit = (match.group("unit") or "day").rstrip("s") or "day"
+    days_per_unit = _UNIT_DAYS.get(unit)
+    if days_per_unit is None:
+        return None
+
+    low = float(match.group("low"))
+    high = float(match.group("high") or low)
+    if high < low:
+        low, high = high, low
+    return low * days_per_unit, high * days_per_unit
@@ -0,0 +1,76 @@
+"""Local text embeddings for plan similarity search."""
+import re
+import zlib
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+EMBEDDING_DIM = 512
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "the", "to", "of", "for", "in", "on", "with", "be",
+    "can", "let", "lets", "allow", "allows", "should", "able", "their", "my",
+    "i", "we", "our", "so", "that", "is", "are", "it", "as", "by", "or",
+}
+# Common product phrasings mapped to a canonical token before hashing
+_PHRASES = [
+    (re.compile(r"\b(sign|log)\s*(in|on)\b"), "login"),
+    (re.compile(r"\bsign\s*up\b"), "register"),
+    (re.compile(r"\b(log|sign)\s*out\b"), "logout"),
+]
+
+
+def _stem(token: str) -> str:
+    """Very small suffix stripper so plurals and verb forms collide."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def _features(text: str) -> list[str]:
+    text = text.lower()
+    for pattern, replacement in _PHRASES:
+        text = pattern.sub(replacement, text)
+    tokens = [_stem(t) for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS]
+
+    features = [f"w:{t}" for t in tokens]
+    features += [f"b:{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"#{token}#"
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+
+def hashed_embedding(text: str) -> "np.ndarray":
+    """
+    Embed text with feature hashing of words, bigrams and char trigrams.
+
+    Deterministic across processes (crc32 instead of ``hash``) and needs no
+    model download. Returns an L2-normalized float32 vector.
+    """
+    import numpy as np
+
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for feature in _features(text):
+        h = zlib.crc32(feature.encode("utf-8"))
+        weight = 0.5 if feature.startswith("c:") else 1.0
+        vector[h % EMBEDDING_DIM] += weight if (h >> 31) & 1 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+_embedder: Callable[[str], "np.ndarray"] = hashed_embedding
+
+
+def set_embedding_function(func: Callable[[str], "np.ndarray"]) -> None:
+    """Replace the embedding function (e.g. with a local sentence model)."""
+    global _embedder
+    _embedder = func
+
+
+def embed_text(text: str) -> "np.ndarray":
+    """Embed text with the configured embedding function."""
+    return _embedder(text)
@@ -0,0 +1,261 @@
+"""Pub/sub of plan change events: in-process, database-polled across workers, or pluggable."""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class Subscription:
+    """One subscriber's queue of (event_id, event) pairs."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        # Set when events were dropped because the subscriber fell behind
+        self.lagged = False
+
+    def _put(self, item: tuple[str, dict]) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    def drain(self) -> None:
+        """Discard queued events (the client is about to resync)."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.lagged = False
+
+
+class EventBus:
+    """
+    Fans plan events out to subscribers in this process.
+
+    ``publish`` delivers locally. To fan out across workers or hosts,
+    subclass it so ``publish`` sends to a broker (e.g. Redis pub/sub) and
+    call ``deliver`` for every message the broker hands back, then point
+    EVENT_BUS_BACKEND at it as ``"package.module:ClassName"``.
+
+    Every delivered event gets an id of the form ``<bus id>:<sequence>``.
+    Recent events are kept so a reconnecting client (SSE Last-Event-ID)
+    can replay what it missed from the same process.
+    """
+
+    def __init__(self):
+        self.bus_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._sequence = 0
+        self._recent: deque = deque(maxlen=settings.EVENT_REPLAY_SIZE)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> str:
+        """Id of the latest delivered event; a client resyncing now resumes after it."""
+        return f"{self.bus_id}:{self._sequence}"
+
+    def publish(self, event: dict) -> None:
+        """Publish an event. Thread-safe; never blocks on subscribers."""
+        self.deliver(event)
+
+    def deliver(self, event: dict, sequence: Optional[int] = None) -> None:
+        """
+        Hand an event to every subscriber in this process.
+
+        ``sequence`` lets a shared bus reuse the broker's increasing ids.
+        """
+        with self._lock:
+            self._sequence = sequence if sequence is not None else self._sequence + 1
+            item = (f"{self.bus_id}:{self._sequence}", event)
+            self._recent.append(item)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber._put, item)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(subscriber)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> tuple[Subscription, bool]:
+        """
+        Register a subscriber on the running event loop.
+
+        Events after ``last_event_id`` are queued for replay when still held.
+
+        Returns:
+            The subscription, and whether the client must resync because
+            events after ``last_event_id`` can no longer be replayed
+        """
+        subscription = Subscription(asyncio.get_running_loop(), settings.EVENT_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if not last_event_id:
+                return subscription, False
+            missed = self._replay_after(last_event_id)
+        if missed is None:
+            return subscription, True
+        for item in missed:
+            subscription._put(item)
+        return subscription, subscription.lagged
+
+    def _replay_after(self, last_event_id: str) -> Optional[list]:
+        bus_id, _, sequence = last_event_id.rpartition(":")
+        if bus_id != self.bus_id or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        oldest = self._sequence - len(self._recent) + 1
+        if sequence + 1 < oldest:
+            return None
+        return [item for item in self._recent if int(item[0].rpartition(":")[2]) > sequence]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class DatabaseEventBus(EventBus):
+    """
+    Shares events between workers through the ``plan_events`` table.
+
+    ``publish`` inserts a row; a background thread in every process polls
+    for new rows and delivers them in id order. Event ids are the row ids,
+    so a client can reconnect to any worker and replay from the table.
+    Rows older than EVENT_RETENTION_SECONDS are deleted.
+
+    Uses its own connections (no pooling) so polling never shares a
+    connection with request sessions.
+    """
+
+    _BATCH_SIZE = 500
+    _CLEANUP_EVERY = 120
+
+    def __init__(self):
+        from sqlalchemy import create_engine, func, select
+        from sqlalchemy.pool import NullPool
+
+        from ..models import PlanEvent
+
+        super().__init__()
+        self.bus_id = "db"
+        self._engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+        with self._engine.connect() as conn:
+            self._sequence = conn.execute(select(func.max(PlanEvent.id))).scalar() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll_loop, name="event-bus-poll", daemon=True)
+        self._thread.start()
+
+    def publish(self, event: dict) -> None:
+        from ..models import PlanEvent
+
+        with self._engine.begin() as conn:
+            conn.execute(PlanEvent.__table__.insert().values(
+                payload=json.dumps(event), created_at=datetime.utcnow()
+            ))
+
+    def _fetch_after(self, sequence: int, upto: Optional[int] = None) -> list:
+        from sqlalchemy import select
+
+        from ..models import PlanEvent
+
+        query = select(PlanEvent.id, PlanEvent.payload).where(PlanEvent.id > sequence)
+        if upto is not None:
+            query = query.where(PlanEvent.id <= upto)
+        with self._engine.connect() as conn:
+            return conn.execute(query.order_by(PlanEvent.id).limit(self._BATCH_SIZE)).all()
+
+    def _poll_loop(self) -> None:
+        polls = 0
+        while not self._stop.wait(settings.EVENT_POLL_SECONDS):
+            try:
+                for row in self._fetch_after(self._sequence):
+                    self.deliver(json.loads(row.payload), sequence=row.id)
+                polls += 1
+                if polls % self._CLEANUP_EVERY == 0:
+                    self._delete_expired()
+            except Exception as e:
+                logger.warning(f"Polling plan events failed: {str(e)}")
+
+    def _delete_expired(self) -> None:
+        from ..models import PlanEvent
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.EVENT_RETENTION_SECONDS)
+        with self._engine.begin() as conn:
+            conn.execute(PlanEvent.__table__.delete().where(PlanEvent.created_at < cutoff))
+
+    def _replay_after(self, last_event_id: str) -> Optional[list]:
+        # Any worker can replay from the table, not only the one the client used
+        bus_id, _, sequence = last_event_id.rpartition(":")
+        if bus_id != self.bus_id or not sequence.isdigit() or int(sequence) > self._sequence:
+            return None
+        sequence = int(sequence)
+        if sequence == self._sequence:
+            return []
+        # Expiry deletes the oldest rows first, so the client's last event
+        # (or row 1, for a client that saw none) still being stored means
+        # nothing after it was lost
+        rows = self._fetch_after(max(sequence - 1, 0), upto=self._sequence)
+        if not rows or rows[0].id != max(sequence, 1) or len(rows) == self._BATCH_SIZE:
+            return None
+        return [
+            (f"{self.bus_id}:{row.id}", json.loads(row.payload))
+            for row in rows if row.id > sequence
+        ]
+
+    def close(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+
+
+def _load_bus() -> EventBus:
+    backend = settings.EVENT_BUS_BACKEND or ("database" if settings.WEB_CONCURRENCY > 1 else "memory")
+    if backend == "memory":
+        return EventBus()
+    if backend == "database":
+        logger.info("Using database event bus")
+        return DatabaseEventBus()
+    module_name, _, class_name = backend.partition(":")
+    bus_cls = getattr(importlib.import_module(module_name), class_name)
+    logger.info(f"Using event bus backend: {settings.EVENT_BUS_BACKEND}")
+    return bus_cls()
+
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Get the configured event bus."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = _load_bus()
+    return _bus
+
+
+def set_event_bus(bus: Optional[EventBus]) -> None:
+    """Replace the event bus; None recreates the configured one on next use."""
+    global _bus
+    _bus = bus
+
+
+def publish_event(event_type: str, **data) -> None:
+    """Publish a plan event, logging rather than raising on failure."""
+    try:
+        get_event_bus().publish({"type": event_type, **data})
+    except Exception as e:
+        logger.error(f"Failed to publish {event_type} event: {str(e)}")
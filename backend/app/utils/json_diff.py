@@ -0,0 +1,102 @@
+"""Compact structural diffs between JSON values."""
+import json
+from typing import Any, Optional
+
+# Patch format (None means "unchanged"):
+#   {"v": value}                       replace with value
+#   {"d": {key: patch}, "r": [keys]}   patch/add dict keys, remove keys in "r"
+#   {"l": [item, ...]}                 rebuild a list; each item is
+#       int                            the old element at that index, unchanged
+#       {"i": index, "p": patch}       the old element at that index, patched
+#       {"v": value}                   a new element
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _diff_list(old: list, new: list) -> dict:
+    unused = {}
+    for index, item in enumerate(old):
+        unused.setdefault(_canonical(item), []).append(index)
+
+    items: list = [None] * len(new)
+    pending = []
+    for position, item in enumerate(new):
+        matches = unused.get(_canonical(item))
+        if matches:
+            items[position] = matches.pop(0)
+        else:
+            pending.append(position)
+
+    # Pair changed dict elements with an unused old element carrying the same "id"
+    remaining = sorted(index for indexes in unused.values() for index in indexes)
+    by_id = {}
+    for index in remaining:
+        if isinstance(old[index], dict) and "id" in old[index]:
+            by_id.setdefault(_canonical(old[index]["id"]), []).append(index)
+
+    for position in pending:
+        item = new[position]
+        candidates = by_id.get(_canonical(item["id"])) if isinstance(item, dict) and "id" in item else None
+        if candidates:
+            index = candidates.pop(0)
+            items[position] = {"i": index, "p": diff(old[index], item)}
+        else:
+            items[position] = {"v": item}
+    return {"l": items}
+
+
+def diff(old: Any, new: Any) -> Optional[dict]:
+    """
+    Compute a structural patch turning ``old`` into ``new``.
+
+    Returns:
+        Patch dict, or None if the values are equal
+    """
+    if old == new:
+        return None
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key not in old:
+                changes[key] = {"v": value}
+            else:
+                sub = diff(old[key], value)
+                if sub is not None:
+                    changes[key] = sub
+        patch = {"d": changes}
+        removed = [key for key in old if key not in new]
+        if removed:
+            patch["r"] = removed
+        return patch
+
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_list(old, new)
+
+    return {"v": new}
+
+
+def apply_patch(value: Any, patch: Optional[dict]) -> Any:
+    """Apply a patch produced by ``diff``; ``value`` is not modified."""
+    if patch is None:
+        return value
+    if "v" in patch:
+        return patch["v"]
+    if "d" in patch:
+        result = {key: item for key, item in value.items() if key not in patch.get("r", ())}
+        for key, sub in patch["d"].items():
+            result[key] = apply_patch(value.get(key), sub)
+        return result
+    if "l" in patch:
+        result = []
+        for item in patch["l"]:
+            if isinstance(item, int):
+                result.append(value[item])
+            elif "i" in item:
+                result.append(apply_patch(value[item["i"]], item["p"]))
+            else:
+                result.append(item["v"])
+        return result
+    raise ValueError(f"Invalid patch: {patch}")
@@ -0,0 +1,227 @@
+"""Tolerant, incremental JSON extraction and repair for LLM output."""
+import json
+import logging
+import re
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"```[a-zA-Z]*")
+_WHITESPACE = " \t\r\n"
+_CLOSERS = {"{": "}", "[": "]"}
+# Characters that may legitimately follow the closing quote of a JSON string
+_AFTER_STRING = {",", "}", "]", ":"}
+
+
+def strip_fences(text: str) -> str:
+    """
+    Remove markdown code fences (```json ... ```) around LLM output.
+
+    Only an opening fence at the start of a line before the first ``{``
+    and a closing fence after the last ``}`` are removed, so backticks
+    inside JSON strings survive. Chunks without braces (continuations)
+    may carry just an opening or just a closing fence.
+    """
+    text = text or ""
+    start = text.find("```")
+    brace = text.find("{")
+    if (
+        start != -1
+        and (brace == -1 or start < brace)
+        and (start == 0 or text[start - 1] == "\n" or not text[:start].strip())
+        and text[start + 3:].strip()
+    ):
+        text = text[_FENCE_RE.match(text, start).end():]
+    end = text.rfind("```")
+    last_brace = text.rfind("}")
+    if end != -1 and end > last_brace and (last_brace != -1 or not text[end + 3:].strip()):
+        text = text[:end]
+    return text
+
+
+class IncrementalJSONParser:
+    """
+    Extract and repair a single JSON object from chatty LLM output.
+
+    Text can be fed in chunks (e.g. a first response followed by a
+    continuation), so a truncated answer never has to be re-parsed or
+    regenerated from scratch. Anything before the first ``{`` and after
+    the matching ``}`` is ignored.
+
+    Repairs applied while scanning:
+    - trailing commas before ``}`` / ``]``
+    - unescaped quotes and raw newlines inside strings
+    - truncation (unterminated strings, open containers, dangling keys)
+
+    A truncated value is kept but reported by ``partial_key``, so callers
+    can request that part again instead of using it as if complete.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._out: list[str] = []
+        self._stack: list[str] = []
+        self._cuts: list[tuple[int, list[str]]] = []
+        self._raw: list[str] = []
+        self._started = False
+        self._complete = False
+        self._in_string = False
+        self._escape = False
+        self._partial_key: Optional[str] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the start of a JSON object has been seen."""
+        return self._started
+
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level object has been closed."""
+        return self._complete
+
+    @property
+    def truncated(self) -> bool:
+        """Whether an object was started but never closed."""
+        return self._started and not self._complete
+
+    @property
+    def partial_key(self) -> Optional[str]:
+        """
+        Top-level key whose value the last ``result`` had to cut short.
+
+        Set only for truncated input, when repair closed containers or a
+        string inside that key's value; everything before it is complete.
+        """
+        return self._partial_key
+
+    @property
+    def raw_text(self) -> str:
+        """Raw text consumed since the start of the object."""
+        return "".join(self._raw) + self._buf
+
+    def feed(self, chunk: str) -> None:
+        """Consume another chunk of model output."""
+        if self._complete or not chunk:
+            return
+        self._buf += chunk
+        self._consume(final=False)
+
+    def result(self) -> Optional[Any]:
+        """Return the best-effort parsed object, or None if nothing usable."""
+        self._consume(final=True)
+        if not self._started:
+            return None
+
+        out = list(self._out)
+        stack = list(self._stack)
+        if self._in_string:
+            if self._escape:
+                out.pop()
+            out.append('"')
+
+        self._partial_key = None
+        candidates = [(out, stack, self._in_string)]
+        if self.truncated:
+            # Fall back to cutting at the last complete element boundaries.
+            # A complete object that does not parse was misread somewhere
+            # (e.g. an unescaped quote), so a cut could silently drop
+            # anything after that point.
+            for pos, cut_stack in reversed(self._cuts):
+                candidates.append((self._out[:pos], cut_stack, False))
+
+        for tokens, open_stack, closed_string in candidates:
+            text = "".join(tokens).rstrip(_WHITESPACE).rstrip(",")
+            text += "".join(_CLOSERS[c] for c in reversed(open_stack))
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if self.truncated and (len(open_stack) > 1 or closed_string) and isinstance(data, dict) and data:
+                self._partial_key = next(reversed(data))
+            return data
+
+        logger.warning("Unable to repair JSON from LLM output")
+        return None
+
+    def _consume(self, final: bool) -> None:
+        buf = self._buf
+        n = len(buf)
+        i = 0
+
+        if not self._started:
+            start = buf.find("{")
+            if start == -1:
+                self._buf = ""
+                return
+            self._started = True
+            i = start
+
+        while i < n and not self._complete:
+            ch = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._out.append(ch)
+                    self._escape = False
+                elif ch == "\\":
+                    self._out.append(ch)
+                    self._escape = True
+                elif ch == '"':
+                    j = i + 1
+                    while j < n and buf[j] in _WHITESPACE:
+                        j += 1
+                    if j == n and not final:
+                        # Need more input to decide whether this quote ends the string
+                        break
+                    if j == n or buf[j] in _AFTER_STRING:
+                        self._out.append('"')
+                        self._in_string = False
+                    else:
+                        self._out.append('\\"')
+                elif ch == "\n":
+                    self._out.append("\\n")
+                elif ch == "\r":
+                    self._out.append("\\r")
+                elif ch == "\t":
+                    self._out.append("\\t")
+                else:
+                    self._out.append(ch)
+            elif ch == '"':
+                self._in_string = True
+                self._out.append(ch)
+            elif ch in "{[":
+                self._stack.append(ch)
+                self._out.append(ch)
+                self._cuts.append((len(self._out), list(self._stack)))
+            elif ch in "}]":
+                self._drop_trailing_comma()
+                if self._stack:
+                    # Close whatever is actually open, even if the model mixed up brackets
+                    self._out.append(_CLOSERS[self._stack.pop()])
+                if not self._stack:
+                    self._complete = True
+            elif ch == ",":
+                self._cuts.append((len(self._out), list(self._stack)))
+                self._out.append(ch)
+            else:
+                self._out.append(ch)
+
+            self._raw.append(ch)
+            i += 1
+
+        self._buf = "" if self._complete else buf[i:]
+
+    def _drop_trailing_comma(self) -> None:
+        idx = len(self._out) - 1
+        while idx >= 0 and self._out[idx] in _WHITESPACE:
+            idx -= 1
+        if idx >= 0 and self._out[idx] == ",":
+            del self._out[idx]
+            self._cuts = [cut for cut in self._cuts if cut[0] <= idx]
+
+
+def parse_json_tolerant(text: str) -> Optional[Any]:
+    """Extract and repair the first JSON object found in text."""
+    parser = IncrementalJSONParser()
+    parser.feed(strip_fences(text))
+    return parser.result()
@@ -2,161 +2,633 @@
 import json
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from groq import Groq
+from pydantic import ValidationError
 from ..config import get_settings
+from ..schemas import EngineeringTask, UserStory
+from .json_repair import IncrementalJSONParser, strip_fences
+from .llm_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Initialize Groq client lazily
 _client = None
+_client_lock = threading.Lock()
 
 def get_client():
-    """Get or create Groq client."""
+    """Get or create Groq client (the SDK is imported on first use)."""
     global _client
     if _client is None:
-        try:
-            _client = Groq(api_key=settings.GROQ_API_KEY)
-        except Exception as e:
-            logger.error(f"Failed to initialize Groq client: {str(e)}")
-            raise
+        with _client_lock:
+            if _client is None:
+                try:
+                    from groq import Groq
+                    _client = Groq(api_key=settings.GROQ_API_KEY)
+                except Exception as e:
+                    logger.error(f"Failed to initialize Groq client: {str(e)}")
+                    raise
     return _client
 
 
-def generate_feature_plan(
+def reset_client() -> None:
+    """Forget the LLM client and response cache connections (e.g. after fork)."""
+    global _client, _response_cache
+    _client = None
+    _response_cache = None
+
+
+SYSTEM_PROMPT = (
+    "You are a senior product manager who turns feature requests into "
+    "actionable plans. Always respond with a single valid JSON object and "
+    "no additional commentary."
+)
+
+PLAN_FORMAT = """Return a JSON object with exactly these keys:
+{
+  "user_stories": [
+    {"title": str, "description": str, "acceptance_criteria": [str, ...]}
+  ],
+  "engineering_tasks": {
+    "Frontend": [TASK, ...],
+    "Backend": [TASK, ...],
+    "Database": [TASK, ...],
+    "Infrastructure": [TASK, ...]
+  },
+  "risks": [
+    {"risk": str, "mitigation": str, "severity": "High" | "Medium" | "Low"}
+  ]
+}
+where TASK is
+{"id": str, "title": str, "description": str, "category": str,
+ "priority": "High" | "Medium" | "Low", "estimated_effort": str, "order": int}"""
+
+SECTION_PROMPTS = {
+    "user_stories": (
+        'Return a JSON object {"user_stories": [...]} where each story is '
+        '{"title": str, "description": str, "acceptance_criteria": [str, ...]}.'
+    ),
+    "engineering_tasks": (
+        'Return a JSON object {"engineering_tasks": {CATEGORY: [TASK, ...]}} '
+        "with categories Frontend, Backend, Database and Infrastructure, where TASK is "
+        '{"id": str, "title": str, "description": str, "category": str, '
+        '"priority": "High" | "Medium" | "Low", "estimated_effort": str, "order": int}.'
+    ),
+    "risks": (
+        'Return a JSON object {"risks": [...]} where each risk is '
+        '{"risk": str, "mitigation": str, "severity": "High" | "Medium" | "Low"}.'
+    ),
+}
+
+CATEGORY_TASKS_PROMPT = (
+    'Return a JSON object {{"tasks": [TASK, ...]}} containing only the '
+    "{category} engineering tasks for this feature, where TASK is "
+    '{{"id": str, "title": str, "description": str, "category": "{category}", '
+    '"priority": "High" | "Medium" | "Low", "estimated_effort": str, "order": int}}. '
+    'Return {{"tasks": []}} if no {category} work is needed.'
+)
+
+CONTINUE_PROMPT = (
+    "Your previous response was cut off. Continue the JSON exactly where it "
+    "stopped. Do not repeat any earlier text and do not add commentary."
+)
+
+PLAN_SECTIONS = ("user_stories", "engineering_tasks", "risks")
+TASK_CATEGORIES = ("Frontend", "Backend", "Database", "Infrastructure")
+
+
+def _describe_feature(
     goal: str,
     users: list[str],
     constraints: list[str],
-    max_retries: int = 3
-) -> Optional[dict]:
+    reference: Optional[object] = None
+) -> str:
+    """Describe the feature request for the prompt, with an optional reference plan."""
+    description = (
+        f"Feature goal: {goal}\n"
+        f"Target users: {', '.join(users)}\n"
+        f"Constraints: {', '.join(constraints)}"
+    )
+    if reference:
+        description += (
+            "\n\nReference from an existing plan for a similar feature. Adapt it "
+            "to this goal, users and constraints; do not copy anything that "
+            f"does not apply:\n{json.dumps(reference, separators=(',', ':'))}"
+        )
+    return description
+
+
+def _reference_for(reference: Optional[dict], section: str, category: Optional[str] = None) -> Optional[object]:
+    """The part of a reference plan matching one section (or task category)."""
+    if not reference:
+        return None
+    value = reference.get(section)
+    if category:
+        value = value.get(category) if isinstance(value, dict) else None
+    return value
+
+
+class PromptTemplate:
     """
-    Generate a feature plan using Groq API.
+    Chat prompt with a precompiled static prefix.
 
-    Args:
-        goal: The feature goal
-        users: List of user personas
-        constraints: List of constraints
-        max_retries: Number of retries for JSON parsing
+    The system message (role and output format) is built once and reused for
+    every call, so only the short feature description is formatted per
+    request and the provider always sees an identical, cacheable prefix.
+    """
+
+    def __init__(self, instructions: str):
+        self._system_message = {
+            "role": "system",
+            "content": f"{SYSTEM_PROMPT}\n\n{instructions}",
+        }
+
+    def messages(
+        self,
+        goal: str,
+        users: list[str],
+        constraints: list[str],
+        reference: Optional[object] = None
+    ) -> list[dict]:
+        """Build the chat messages for a feature request."""
+        return [
+            self._system_message,
+            {"role": "user", "content": _describe_feature(goal, users, constraints, reference)},
+        ]
+
+
+PLAN_TEMPLATE = PromptTemplate(PLAN_FORMAT)
+SECTION_TEMPLATES = {
+    section: PromptTemplate(instructions)
+    for section, instructions in SECTION_PROMPTS.items()
+}
+CATEGORY_TEMPLATES = {
+    category: PromptTemplate(CATEGORY_TASKS_PROMPT.format(category=category))
+    for category in TASK_CATEGORIES
+}
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Get the shared LLM response cache, or None if disabled."""
+    global _response_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache(
+                    settings.LLM_CACHE_PATH,
+                    max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+                )
+    return _response_cache
+
+
+def _chat(messages: list[dict], use_cache: bool = True) -> str:
+    """
+    Send a chat completion request and return the response text.
+
+    Responses are looked up in the cache (unless ``use_cache`` is False, as
+    on retries) but never stored here: callers store them with
+    ``_cache_response`` once the output has been parsed and validated.
+    """
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(settings.GROQ_MODEL, messages)
+        if cached is not None:
+            logger.info("LLM response cache hit")
+            return cached
+
+    response = get_client().chat.completions.create(
+        model=settings.GROQ_MODEL,
+        messages=messages,
+        temperature=0.3,
+    )
+    return response.choices[0].message.content or ""
+
+
+def _cache_response(messages: list[dict], content: str) -> None:
+    """Store a response that was accepted for ``messages``."""
+    cache = get_response_cache()
+    if cache is not None and content:
+        cache.set(settings.GROQ_MODEL, messages, content)
+
+
+def _validate_section(section: str, value) -> Optional[object]:
+    """
+    Validate one plan section against the response schemas.
+
+    Invalid items are dropped; returns None if nothing usable remains.
+    """
+    if section == "user_stories":
+        if not isinstance(value, list):
+            return None
+        stories = []
+        for story in value:
+            try:
+                stories.append(UserStory(**story).model_dump())
+            except (TypeError, ValidationError):
+                logger.warning(f"Dropping invalid user story: {story}")
+        return stories or None
+
+    if section == "engineering_tasks":
+        if not isinstance(value, dict):
+            return None
+        tasks = {}
+        for category, items in value.items():
+            if not isinstance(items, list):
+                continue
+            tasks[category] = []
+            for index, task in enumerate(items, start=1):
+                if not isinstance(task, dict):
+                    continue
+                task.setdefault("category", category)
+                task.setdefault("order", index)
+                try:
+                    tasks[category].append(EngineeringTask(**task).model_dump())
+                except ValidationError:
+                    logger.warning(f"Dropping invalid engineering task: {task}")
+        return tasks if any(tasks.values()) else None
+
+    if section == "risks":
+        if not isinstance(value, list):
+            return None
+        risks = []
+        for risk in value:
+            if isinstance(risk, dict) and risk.get("risk") and risk.get("mitigation"):
+                risk.setdefault("severity", "Medium")
+                risks.append(risk)
+            else:
+                logger.warning(f"Dropping invalid risk: {risk}")
+        return risks or None
+
+    return None
+
+
+def validate_plan_data(data) -> tuple[dict, list[str]]:
+    """
+    Validate parsed plan data section by section.
 
     Returns:
-        Parsed feature plan dict or None if failed
+        Tuple of (valid sections, names of sections that need regeneration)
     """
-    try:
-        logger.info(f"Generating mock feature plan for: {goal}")
+    plan = {}
+    failed = []
+    if not isinstance(data, dict):
+        return plan, list(PLAN_SECTIONS)
+    for section in PLAN_SECTIONS:
+        value = _validate_section(section, data.get(section))
+        if value is None:
+            failed.append(section)
+        else:
+            plan[section] = value
+    return plan, failed
 
-        # Return a mock feature plan for testing
-        mock_plan = {
-            "user_stories": [
-                {
-                    "title": f"User can {goal.lower()}",
-                    "description": f"As a {users[0] if users else 'user'}, I want to {goal.lower()} so that I can achieve my objectives.",
-                    "acceptance_criteria": [
-                        f"User can successfully {goal.lower()}",
-                        "System provides appropriate feedback",
-                        "Process completes within reasonable time"
-                    ]
-                },
+
+def _complete_sections(parser: IncrementalJSONParser) -> Optional[object]:
+    """Parsed object without the top-level value that truncation cut short."""
+    data = parser.result()
+    if parser.partial_key is not None:
+        logger.warning(f"Discarding truncated section: {parser.partial_key}")
+        del data[parser.partial_key]
+    return data
+
+
+def _parse_with_continuation(
+    messages: list[dict],
+    max_continuations: int
+) -> tuple[Optional[dict], int, str]:
+    """
+    Request a completion and parse it, asking the model to continue if truncated.
+
+    Continuations always go to the model, never the cache.
+
+    Returns:
+        Tuple of (parsed object or None, number of LLM calls made, full raw
+        text of the object, which is what to cache once it validates)
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(strip_fences(_chat(messages)))
+    calls = 1
+
+    while parser.truncated and calls <= max_continuations:
+        logger.warning("LLM response truncated, requesting continuation")
+        continuation = _chat(messages + [
+            {"role": "assistant", "content": parser.raw_text},
+            {"role": "user", "content": CONTINUE_PROMPT},
+        ], use_cache=False)
+        parser.feed(strip_fences(continuation))
+        calls += 1
+
+    return _complete_sections(parser), calls, parser.raw_text
+
+
+def _request_section(
+    section: str,
+    goal: str,
+    users: list[str],
+    constraints: list[str],
+    category: Optional[str] = None,
+    use_cache: bool = True,
+    reference: Optional[dict] = None
+) -> Optional[object]:
+    """
+    Ask the LLM for a single plan section only.
+
+    With a category, only that category's engineering tasks are requested
+    and a list of tasks (possibly empty) is returned. Pass ``use_cache=False``
+    on retries so a previous answer is not simply replayed. ``reference`` is
+    a similar stored plan; only its matching part goes into the prompt.
+    """
+    if settings.USE_MOCK_LLM:
+        value = _mock_feature_plan(goal, users)[section]
+        return value[category] if category else value
+
+    template = CATEGORY_TEMPLATES[category] if category else SECTION_TEMPLATES[section]
+    messages = template.messages(
+        goal, users, constraints, _reference_for(reference, section, category)
+    )
+    content = _chat(messages, use_cache=use_cache)
+    parser = IncrementalJSONParser()
+    parser.feed(strip_fences(content))
+    data = _complete_sections(parser)
+    if not isinstance(data, dict):
+        return None
+
+    if category:
+        tasks = data.get("tasks")
+        if tasks == []:
+            value = []
+        else:
+            validated = _validate_section(section, {category: tasks})
+            value = validated[category] if validated else None
+    else:
+        value = _validate_section(section, data.get(section))
+
+    if value is not None:
+        _cache_response(messages, content)
+    return value
+
+
+def _request_section_with_retry(
+    key: str,
+    goal: str,
+    users: list[str],
+    constraints: list[str],
+    max_retries: int,
+    reference: Optional[dict] = None
+) -> Optional[object]:
+    """Request a section (``section`` or ``section:category``), retrying on failure."""
+    section, _, category = key.partition(":")
+    for attempt in range(1, max_retries + 1):
+        try:
+            value = _request_section(
+                section, goal, users, constraints, category or None,
+                use_cache=attempt == 1, reference=reference
+            )
+            if value is not None:
+                return value
+            logger.warning(f"Invalid output for section {key} (attempt {attempt}/{max_retries})")
+        except Exception as e:
+            logger.warning(f"Error generating section {key} (attempt {attempt}/{max_retries}): {str(e)}")
+    return None
+
+
+def _mock_feature_plan(goal: str, users: list[str]) -> dict:
+    """Return a mock feature plan for testing without the LLM."""
+    return {
+        "user_stories": [
+            {
+                "title": f"User can {goal.lower()}",
+                "description": f"As a {users[0] if users else 'user'}, I want to {goal.lower()} so that I can achieve my objectives.",
+                "acceptance_criteria": [
+                    f"User can successfully {goal.lower()}",
+                    "System provides appropriate feedback",
+                    "Process completes within reasonable time"
+                ]
+            },
+            {
+                "title": f"Admin can manage {goal.lower()} settings",
+                "description": f"As an admin, I want to configure {goal.lower()} settings so that I can customize the experience.",
+                "acceptance_criteria": [
+                    "Admin interface provides configuration options",
+                    "Settings are validated before saving",
+                    "Changes take effect immediately"
+                ]
+            },
+            {
+                "title": f"System handles {goal.lower()} errors gracefully",
+                "description": f"As a user, I want the system to handle errors during {goal.lower()} so that I don't lose my work.",
+                "acceptance_criteria": [
+                    "Error messages are clear and actionable",
+                    "System provides recovery options",
+                    "Failed operations can be retried"
+                ]
+            }
+        ],
+        "engineering_tasks": {
+            "Frontend": [
                 {
-                    "title": f"Admin can manage {goal.lower()} settings",
-                    "description": f"As an admin, I want to configure {goal.lower()} settings so that I can customize the experience.",
-                    "acceptance_criteria": [
-                        "Admin interface provides configuration options",
-                        "Settings are validated before saving",
-                        "Changes take effect immediately"
-                    ]
+                    "id": "FE-001",
+                    "category": "Frontend",
+                    "title": f"Create {goal.lower()} user interface",
+                    "description": f"Build React components for {goal.lower()} functionality",
+                    "priority": "High",
+                    "estimated_effort": "2-3 days",
+                    "order": 1
                 },
                 {
-                    "title": f"System handles {goal.lower()} errors gracefully",
-                    "description": f"As a user, I want the system to handle errors during {goal.lower()} so that I don't lose my work.",
-                    "acceptance_criteria": [
-                        "Error messages are clear and actionable",
-                        "System provides recovery options",
-                        "Failed operations can be retried"
-                    ]
+                    "id": "FE-002",
+                    "category": "Frontend",
+                    "title": f"Add form validation for {goal.lower()}",
+                    "description": "Implement client-side validation with error handling",
+                    "priority": "Medium",
+                    "estimated_effort": "1 day",
+                    "order": 2
                 }
             ],
-            "engineering_tasks": {
-                "Frontend": [
-                    {
-                        "id": "FE-001",
-                        "category": "Frontend",
-                        "title": f"Create {goal.lower()} user interface",
-                        "description": f"Build React components for {goal.lower()} functionality",
-                        "priority": "High",
-                        "estimated_effort": "2-3 days",
-                        "order": 1
-                    },
-                    {
-                        "id": "FE-002",
-                        "category": "Frontend",
-                        "title": f"Add form validation for {goal.lower()}",
-                        "description": "Implement client-side validation with error handling",
-                        "priority": "Medium",
-                        "estimated_effort": "1 day",
-                        "order": 2
-                    }
-                ],
-                "Backend": [
-                    {
-                        "id": "BE-001",
-                        "category": "Backend",
-                        "title": f"Implement {goal.lower()} API endpoint",
-                        "description": f"Create FastAPI endpoint for {goal.lower()} operations",
-                        "priority": "High",
-                        "estimated_effort": "2-3 days",
-                        "order": 1
-                    },
-                    {
-                        "id": "BE-002",
-                        "category": "Backend",
-                        "title": f"Add {goal.lower()} business logic",
-                        "description": "Implement core business logic and validation",
-                        "priority": "High",
-                        "estimated_effort": "2 days",
-                        "order": 2
-                    }
-                ],
-                "Database": [
-                    {
-                        "id": "DB-001",
-                        "category": "Database",
-                        "title": f"Create {goal.lower()} data model",
-                        "description": f"Design and implement database schema for {goal.lower()}",
-                        "priority": "Medium",
-                        "estimated_effort": "1-2 days",
-                        "order": 1
-                    }
-                ],
-                "Infrastructure": []
-            },
-            "risks": [
+            "Backend": [
                 {
-                    "risk": f"Performance issues with {goal.lower()} under load",
-                    "mitigation": "Implement caching and optimize database queries",
-                    "severity": "Medium"
+                    "id": "BE-001",
+                    "category": "Backend",
+                    "title": f"Implement {goal.lower()} API endpoint",
+                    "description": f"Create FastAPI endpoint for {goal.lower()} operations",
+                    "priority": "High",
+                    "estimated_effort": "2-3 days",
+                    "order": 1
                 },
                 {
-                    "risk": f"Security vulnerabilities in {goal.lower()} implementation",
-                    "mitigation": "Conduct security review and implement proper validation",
-                    "severity": "High"
-                },
+                    "id": "BE-002",
+                    "category": "Backend",
+                    "title": f"Add {goal.lower()} business logic",
+                    "description": "Implement core business logic and validation",
+                    "priority": "High",
+                    "estimated_effort": "2 days",
+                    "order": 2
+                }
+            ],
+            "Database": [
                 {
-                    "risk": f"Integration issues with existing systems",
-                    "mitigation": "Test thoroughly and create migration plan",
-                    "severity": "Medium"
+                    "id": "DB-001",
+                    "category": "Database",
+                    "title": f"Create {goal.lower()} data model",
+                    "description": f"Design and implement database schema for {goal.lower()}",
+                    "priority": "Medium",
+                    "estimated_effort": "1-2 days",
+                    "order": 1
                 }
-            ]
-        }
+            ],
+            "Infrastructure": []
+        },
+        "risks": [
+            {
+                "risk": f"Performance issues with {goal.lower()} under load",
+                "mitigation": "Implement caching and optimize database queries",
+                "severity": "Medium"
+            },
+            {
+                "risk": f"Security vulnerabilities in {goal.lower()} implementation",
+                "mitigation": "Conduct security review and implement proper validation",
+                "severity": "High"
+            },
+            {
+                "risk": f"Integration issues with existing systems",
+                "mitigation": "Test thoroughly and create migration plan",
+                "severity": "Medium"
+            }
+        ]
+    }
+
+
+def generate_feature_plan(
+    goal: str,
+    users: list[str],
+    constraints: list[str],
+    max_retries: int = 3,
+    reference: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    Generate a feature plan using Groq API.
 
-        logger.info("Mock feature plan generated successfully")
-        return mock_plan
+    Malformed output is repaired locally first; the LLM is only asked again
+    for a continuation of a truncated response or for the specific sections
+    that could not be repaired or validated.
+
+    Args:
+        goal: The feature goal
+        users: List of user personas
+        constraints: List of constraints
+        max_retries: Number of follow-up LLM calls allowed for JSON repair
+        reference: Similar stored plan to adapt, included in the prompt
+
+    Returns:
+        Parsed feature plan dict or None if failed
+    """
+    try:
+        if settings.USE_MOCK_LLM:
+            logger.info(f"Generating mock feature plan for: {goal}")
+            mock_plan = _mock_feature_plan(goal, users)
+            logger.info("Mock feature plan generated successfully")
+            return mock_plan
+
+        logger.info(f"Generating feature plan for: {goal}")
+        messages = PLAN_TEMPLATE.messages(goal, users, constraints, reference)
+        data, calls, raw_text = _parse_with_continuation(messages, max_retries)
+        retries_left = max_retries - (calls - 1)
+
+        plan, failed = validate_plan_data(data)
+        if not failed:
+            _cache_response(messages, raw_text)
+        # Spread the retry budget round-robin over the failed sections
+        attempts = dict.fromkeys(failed, 0)
+        while retries_left > 0 and any(section not in plan for section in failed):
+            for section in failed:
+                if section in plan or retries_left == 0:
+                    continue
+                logger.warning(f"Regenerating plan section: {section}")
+                retries_left -= 1
+                attempts[section] += 1
+                value = _request_section(
+                    section, goal, users, constraints,
+                    use_cache=attempts[section] == 1, reference=reference
+                )
+                if value is not None:
+                    plan[section] = value
+
+        missing = [section for section in PLAN_SECTIONS if section not in plan]
+        if missing:
+            logger.error(f"LLM plan is missing sections after repair: {missing}")
+            return None
+
+        logger.info("Feature plan generated successfully")
+        return plan
 
     except Exception as e:
-        logger.error(f"Error generating mock feature plan: {str(e)}")
+        logger.error(f"Error generating feature plan: {str(e)}")
         return None
 
 
+def generate_feature_plan_sectioned(
+    goal: str,
+    users: list[str],
+    constraints: list[str],
+    max_retries: int = 3,
+    max_concurrency: Optional[int] = None,
+    reference: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    Generate a feature plan from concurrent, per-section LLM calls.
+
+    User stories, each engineering task category and risks are requested
+    in parallel and merged into the regular plan structure, so latency is
+    bounded by the slowest section rather than the whole document.
+
+    Args:
+        goal: The feature goal
+        users: List of user personas
+        constraints: List of constraints
+        max_retries: Attempts per section
+        max_concurrency: Maximum concurrent LLM calls (defaults to settings)
+        reference: Similar stored plan to adapt, included in each prompt
+
+    Returns:
+        Parsed feature plan dict or None if any section failed
+    """
+    keys = ["user_stories"]
+    keys += [f"engineering_tasks:{category}" for category in TASK_CATEGORIES]
+    keys.append("risks")
+    workers = max(1, min(max_concurrency or settings.LLM_MAX_CONCURRENCY, len(keys)))
+
+    logger.info(f"Generating sectioned feature plan for: {goal} ({workers} workers)")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plan-section") as pool:
+        futures = {
+            key: pool.submit(
+                _request_section_with_retry, key, goal, users, constraints, max_retries, reference
+            )
+            for key in keys
+        }
+        results = {key: future.result() for key, future in futures.items()}
+
+    failed = [key for key, value in results.items() if value is None]
+    if failed:
+        logger.error(f"Failed to generate plan sections: {failed}")
+        return None
+
+    logger.info("Sectioned feature plan generated successfully")
+    return {
+        "user_stories": results["user_stories"],
+        "engineering_tasks": {
+            category: results[f"engineering_tasks:{category}"]
+            for category in TASK_CATEGORIES
+        },
+        "risks": results["risks"],
+    }
+
+
 def check_llm_connection() -> bool:
     """Check if LLM connection is working."""
     try:
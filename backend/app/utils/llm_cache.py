@@ -0,0 +1,116 @@
+"""Disk-backed LLM response cache shared across restarts and workers."""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, messages: list[dict]) -> str:
+    """Hash the model and full prompt into a cache key."""
+    payload = json.dumps([model, messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache with size-bounded LRU eviction.
+
+    The database runs in WAL mode so several worker processes can read and
+    write it concurrently. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_access "
+                "ON llm_responses (last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, model: str, messages: list[dict]) -> Optional[str]:
+        """Return a cached response, or None on a miss."""
+        key = cache_key(model, messages)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE llm_responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            return None
+
+    def set(self, model: str, messages: list[dict], response: str) -> None:
+        """Store a response and evict least recently used entries over the size limit."""
+        key = cache_key(model, messages)
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        rows = conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_access"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+            evicted += 1
+        conn.executemany("DELETE FROM llm_responses WHERE key = ?", stale)
+        logger.info(f"Evicted {evicted} LLM cache entries")
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._connect().execute("DELETE FROM llm_responses")
@@ -6,13 +6,19 @@ from ..config import get_settings
 settings = get_settings()
 
 
+_HANDLER_NAME = "tasks-generator-console"
+
+
 def setup_logger() -> logging.Logger:
-    """Configure and return the root logger."""
+    """Configure and return the root logger (safe to call more than once)."""
     logger = logging.getLogger()
     logger.setLevel(settings.LOG_LEVEL)
+    if any(handler.get_name() == _HANDLER_NAME for handler in logger.handlers):
+        return logger
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.set_name(_HANDLER_NAME)
     console_handler.setLevel(settings.LOG_LEVEL)
 
     # Formatter
@@ -28,4 +34,5 @@ def setup_logger() -> logging.Logger:
     return logger
 
 
-logger = setup_logger()
+# Configured by the application entry point via setup_logger()
+logger = logging.getLogger()
@@ -0,0 +1,197 @@
+"""Per-client rate limiting and admission control for expensive endpoints."""
+import hashlib
+import importlib
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class RateLimitBackend(ABC):
+    """
+    Token bucket store interface.
+
+    Implement this to share buckets across workers or hosts (e.g. Redis) and
+    point RATE_LIMIT_BACKEND at it as ``"package.module:ClassName"``.
+    """
+
+    @abstractmethod
+    def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        """
+        Take tokens from a bucket.
+
+        Returns:
+            0 if allowed, otherwise seconds until enough tokens are available
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local token buckets."""
+
+    _PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (tokens, updated_at, seconds until full again)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+        self._calls = 0
+
+    def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        refill_time = capacity / refill_per_second
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.get(key, (capacity, now, refill_time))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now, refill_time)
+
+            self._calls += 1
+            if self._calls % self._PRUNE_EVERY == 0:
+                self._prune(now)
+        return retry_after
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have been idle long enough to be full again."""
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket[1] < bucket[2]
+        }
+
+
+class AdmissionController:
+    """Caps the number of in-flight requests of one kind in this process."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._inflight = 0
+        self._closed = False
+        self._idle = threading.Condition()
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def try_acquire(self) -> bool:
+        with self._idle:
+            if self._closed or self._inflight >= self.capacity:
+                return False
+            self._inflight += 1
+            return True
+
+    def release(self) -> None:
+        with self._idle:
+            self._inflight = max(0, self._inflight - 1)
+            if self._inflight == 0:
+                self._idle.notify_all()
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Stop admitting requests and wait for in-flight ones to finish.
+
+        Returns:
+            True if all in-flight requests finished within the timeout
+        """
+        with self._idle:
+            self._closed = True
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout=timeout)
+
+
+def _load_backend() -> RateLimitBackend:
+    if not settings.RATE_LIMIT_BACKEND:
+        return InMemoryRateLimitBackend()
+    module_name, _, class_name = settings.RATE_LIMIT_BACKEND.partition(":")
+    backend_cls = getattr(importlib.import_module(module_name), class_name)
+    logger.info(f"Using rate limit backend: {settings.RATE_LIMIT_BACKEND}")
+    return backend_cls()
+
+
+_backend: Optional[RateLimitBackend] = None
+generation_admission = AdmissionController(settings.MAX_INFLIGHT_GENERATIONS)
+
+# Budget name -> (requests per minute, burst size)
+BUDGETS = {
+    "generate": (settings.RATE_LIMIT_GENERATE_PER_MINUTE, settings.RATE_LIMIT_GENERATE_BURST),
+    "read": (settings.RATE_LIMIT_READ_PER_MINUTE, settings.RATE_LIMIT_READ_BURST),
+    "write": (settings.RATE_LIMIT_WRITE_PER_MINUTE, settings.RATE_LIMIT_WRITE_BURST),
+}
+
+
+def get_backend() -> RateLimitBackend:
+    """Get the configured rate limit backend."""
+    global _backend
+    if _backend is None:
+        _backend = _load_backend()
+    return _backend
+
+
+def set_backend(backend: RateLimitBackend) -> None:
+    """Replace the rate limit backend (e.g. with a shared store)."""
+    global _backend
+    _backend = backend
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the client by API key, falling back to its IP address.
+
+    Only keys listed in RATE_LIMIT_API_KEYS count; otherwise a client could
+    send a fresh random key per request and get a new bucket every time.
+    The key is hashed so it never reaches logs or a shared bucket store.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in settings.RATE_LIMIT_API_KEYS:
+        return f"key:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def rate_limit(budget: str):
+    """Build a dependency enforcing the named token bucket budget per client."""
+    per_minute, burst = BUDGETS[budget]
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        key = f"{budget}:{client_key(request)}"
+        retry_after = get_backend().consume(key, burst, per_minute / 60.0)
+        if retry_after > 0:
+            logger.warning(f"Rate limit exceeded for {key}")
+            raise _too_many_requests("Rate limit exceeded", retry_after)
+
+    return dependency
+
+
+async def admit_generation():
+    """Dependency shedding generate requests once in-flight capacity is full."""
+    if not generation_admission.try_acquire():
+        logger.warning(f"Shedding generate request: {generation_admission.inflight} in flight")
+        raise _too_many_requests(
+            "Server is at generation capacity, please retry later",
+            settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+    try:
+        yield
+    finally:
+        generation_admission.release()
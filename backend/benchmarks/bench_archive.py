@@ -0,0 +1,128 @@
+"""
+Benchmark cold-tier archiving: storage size and hot vs cold read latency.
+
+Creates mock plans in a temporary SQLite database, measures reads of
+the hot table, archives every plan, then measures cold reads with an
+empty LRU (decompress from the archive table) and with a warm LRU.
+
+Usage (from backend/):
+    python -m benchmarks.bench_archive --plans 500 --reads 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def _read_plan(plan_id: int) -> None:
+    """One GET /api/features/{id} worth of work: load and parse the payload."""
+    from app.database import SessionLocal
+    from app.services.feature_service import FeatureService
+
+    with SessionLocal() as db:
+        plan = FeatureService.get_plan_by_id(plan_id, db)
+        json.loads(plan.user_stories)
+        json.loads(plan.engineering_tasks)
+        json.loads(plan.risks)
+
+
+def measure_reads(plan_ids: list[int], reads: int, before_each=None) -> list[float]:
+    """Seconds per read for ``reads`` random plans."""
+    samples = []
+    rng = random.Random(0)
+    for _ in range(reads):
+        plan_id = rng.choice(plan_ids)
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        _read_plan(plan_id)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _payload_bytes(db) -> int:
+    from app.models import FeaturePlan
+
+    return sum(
+        len(a.encode()) + len(b.encode()) + len(c.encode())
+        for a, b, c in db.query(FeaturePlan.user_stories, FeaturePlan.engineering_tasks, FeaturePlan.risks)
+    )
+
+
+def _file_size(path: str) -> int:
+    from sqlalchemy import text
+    from app.database import engine
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    return os.path.getsize(path)
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    return (
+        f"{label:<28} median {statistics.median(samples) * 1e6:8.1f} us"
+        f"   p95 {statistics.quantiles(samples, n=20)[-1] * 1e6:8.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    db_path = f"{tmp}/archive.db"
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{db_path}",
+        LLM_CACHE_PATH=f"{tmp}/llm_cache.db",
+        LOG_LEVEL="WARNING",
+        USE_MOCK_LLM="True",
+        ARCHIVE_LRU_SIZE=str(args.plans),
+    )
+    sys.path.insert(0, os.getcwd())
+
+    from app.database import SessionLocal, init_db
+    from app.models import PlanArchive
+    from app.services.archive_service import ArchiveService, clear_payload_cache
+    from app.services.feature_service import FeatureService
+    from app.utils.llm import _mock_feature_plan
+
+    init_db()
+    with SessionLocal() as db:
+        plan_ids = []
+        for i in range(args.plans):
+            goal = f"Feature {i}: build a workflow for team {i % 17}"
+            users = ["Admins", f"Team {i % 17} members"]
+            plan = FeatureService._save_plan(goal, users, ["Mobile friendly"], _mock_feature_plan(goal, users), db)
+            plan_ids.append(plan.id)
+        hot_payload = _payload_bytes(db)
+    hot_file = _file_size(db_path)
+
+    hot = measure_reads(plan_ids, args.reads)
+
+    with SessionLocal() as db:
+        ArchiveService.archive_old_plans(db, older_than_days=-1)
+        archive_bytes = sum(row.compressed_size for row in db.query(PlanArchive))
+    cold_file = _file_size(db_path)
+
+    cold = measure_reads(plan_ids, args.reads, before_each=clear_payload_cache)
+    measure_reads(plan_ids, args.reads)  # fill the LRU
+    cached = measure_reads(plan_ids, args.reads)
+
+    print(f"plans: {args.plans}, reads per case: {args.reads}")
+    print(f"{'payload bytes (hot)':<28} {hot_payload:>10}")
+    print(f"{'payload bytes (archived)':<28} {archive_bytes:>10}   ({archive_bytes / hot_payload:.1%})")
+    print(f"{'db file after VACUUM (hot)':<28} {hot_file:>10}")
+    print(f"{'db file after VACUUM (cold)':<28} {cold_file:>10}   ({cold_file / hot_file:.1%})")
+    print(_summary("hot read", hot))
+    print(_summary("cold read (LRU miss)", cold))
+    print(_summary("cold read (LRU hit)", cached))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark cold start: app import time and time to first successful ping.
+
+Each run starts a fresh interpreter. The first ping run uses an empty
+database (schema is created); later runs reuse it, so they show the
+schema-version fast path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HOST = "127.0.0.1"
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import(env: dict) -> float:
+    """Seconds spent importing app.main in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_ping(env: dict, port: int, timeout: float = 30.0) -> float:
+    """Seconds from process launch until /api/health/ping returns 200."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", "1", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                conn = http.client.HTTPConnection(HOST, port, timeout=1)
+                conn.request("GET", "/api/health/ping")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("Server did not answer /api/health/ping in time")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    return (
+        f"{label:<28} median {statistics.median(samples) * 1000:8.1f} ms"
+        f"   min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp}/startup.db",
+            LLM_CACHE_PATH=f"{tmp}/llm_cache.db",
+            LOG_LEVEL="WARNING",
+        )
+        imports = [measure_import(env) for _ in range(args.runs)]
+        first = measure_first_ping(env, args.port)
+        warm = [measure_first_ping(env, args.port) for _ in range(args.runs)]
+
+    print(_summary("import app.main", imports))
+    print(_summary("first ping (new database)", [first]))
+    print(_summary("first ping (existing db)", warm))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark read endpoint throughput against the number of server workers.
+
+Starts ``python -m app.server`` with 1, 2, 4, ... workers on a temporary
+SQLite database seeded with mock plans, drives GET /api/features/recent and
+GET /api/features/{id} from several client processes, and prints requests
+per second for each worker count.
+
+Usage (from backend/):
+    python -m benchmarks.bench_workers --workers 1 2 4 --duration 10 [--preload]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HOST = "127.0.0.1"
+
+
+def _wait_for_server(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(HOST, port, timeout=1)
+            conn.request("GET", "/api/health/ping")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def _seed(port: int, count: int) -> list[int]:
+    ids = []
+    conn = http.client.HTTPConnection(HOST, port, timeout=30)
+    for i in range(count):
+        body = json.dumps({
+            "goal": f"Benchmark feature {i}",
+            "users": ["developer"],
+            "constraints": ["fast"],
+        })
+        conn.request("POST", "/api/features/generate", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        ids.append(json.loads(response.read())["id"])
+    return ids
+
+
+def _client(args: tuple) -> int:
+    port, plan_ids, duration = args
+    conn = http.client.HTTPConnection(HOST, port, timeout=10)
+    done = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if done % 2:
+            path = f"/api/features/{plan_ids[done % len(plan_ids)]}"
+        else:
+            path = "/api/features/recent?limit=5"
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+    return done
+
+
+def run(workers: int, clients: int, duration: float, preload: bool, port: int) -> float:
+    """Run one benchmark round and return requests per second."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+            LLM_CACHE_PATH=f"{tmp}/llm_cache.db",
+            USE_MOCK_LLM="True",
+            RATE_LIMIT_ENABLED="False",
+            LOG_LEVEL="WARNING",
+        )
+        command = [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port)]
+        if preload:
+            command.append("--preload")
+        server = subprocess.Popen(command, env=env)
+        try:
+            _wait_for_server(port)
+            plan_ids = _seed(port, 20)
+            with multiprocessing.Pool(clients) as pool:
+                counts = pool.map(_client, [(port, plan_ids, duration)] * clients)
+            return sum(counts) / duration
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=None, help="Client processes (default: 2x max workers)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--preload", action="store_true")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    clients = args.clients or 2 * max(args.workers)
+    print(f"CPUs: {os.cpu_count()}, clients: {clients}, duration: {args.duration}s, preload: {args.preload}")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        rps = run(workers, clients, args.duration, args.preload, args.port)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.1f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Shared test setup: a throwaway database and no LLM response cache."""
+import os
+import tempfile
+
+import pytest
+
+# Settings are read on first import of the app, so configure them first
+_tmp = tempfile.mkdtemp(prefix="tasks-generator-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_tmp}/test.db",
+    LLM_CACHE_ENABLED="False",
+    USE_MOCK_LLM="True",
+    SIMILAR_PLAN_REUSE="off",
+    RATE_LIMIT_ENABLED="False",
+    LOG_LEVEL="WARNING",
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Session on freshly created tables, with empty in-process caches."""
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Base
+    from app.services import feature_service
+    from app.services.archive_service import clear_payload_cache
+    from app.services.plan_index import PlanSimilarityIndex
+
+    Base.metadata.drop_all(engine)
+    init_db()
+    monkeypatch.setattr(feature_service, "plan_index", PlanSimilarityIndex())
+    clear_payload_cache()
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    """API client sharing the test database."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
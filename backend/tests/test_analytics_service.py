@@ -0,0 +1,100 @@
+"""Tests for incrementally maintained analytics rollups."""
+import copy
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import RiskTotal, TaskTotal
+from app.services.analytics_service import AnalyticsService
+from app.services.feature_service import FeatureService
+
+
+def _totals(db) -> tuple[dict, dict]:
+    """Non-zero task and risk totals, keyed by group."""
+    db.expire_all()
+    tasks = {
+        (row.category, row.priority): (
+            row.task_count,
+            pytest.approx(row.effort_min_days),
+            pytest.approx(row.effort_max_days),
+            row.unparsed_effort_count,
+        )
+        for row in db.query(TaskTotal)
+        if row.task_count or row.unparsed_effort_count or abs(row.effort_max_days) > 1e-9
+    }
+    risks = {row.severity: row.risk_count for row in db.query(RiskTotal) if row.risk_count}
+    return tasks, risks
+
+
+def _summary(db, **kwargs) -> dict:
+    summary = AnalyticsService.get_summary(db, **kwargs)
+    summary.pop("start")
+    summary.pop("end")
+    return summary
+
+
+@pytest.fixture
+def edited_plans(db):
+    """Several generated plans, then a series of task edits."""
+    plans = [
+        FeatureService.generate_plan(goal, ["Students"], ["Offline"], db)
+        for goal in ("Build a todo app", "Build a recipe sharing site", "Build a fitness tracker")
+    ]
+    first, second, third = (json.loads(plan.engineering_tasks) for plan in plans)
+
+    # Priority changes, including a lower-case label
+    edit = copy.deepcopy(first)
+    edit["Frontend"][0]["priority"] = "low"
+    edit["Backend"][0]["priority"] = "High"
+    FeatureService.update_plan_tasks(plans[0].id, edit, db)
+
+    # Remove a category, add tasks with unusual or missing effort
+    edit = copy.deepcopy(second)
+    del edit["Database"]
+    edit["Infrastructure"] = [
+        {"id": "INF-001", "title": "CI", "description": "Set up CI", "category": "Infrastructure",
+         "priority": "Medium", "estimated_effort": "1 week", "order": 1},
+        {"id": "INF-002", "title": "Monitoring", "description": "Add alerts", "category": "Infrastructure",
+         "priority": "Medium", "estimated_effort": "TBD", "order": 2},
+    ]
+    FeatureService.update_plan_tasks(plans[1].id, edit, db)
+
+    # Edit the same plan again, then remove every task from the third plan
+    edit["Infrastructure"][0]["estimated_effort"] = "4h"
+    edit["Frontend"] = []
+    FeatureService.update_plan_tasks(plans[1].id, edit, db)
+    FeatureService.update_plan_tasks(plans[2].id, {category: [] for category in third}, db)
+    return plans
+
+
+def test_incremental_totals_match_rebuild(db, edited_plans):
+    incremental = _totals(db)
+    summary = _summary(db)
+    assert incremental[0]
+
+    assert AnalyticsService.rebuild(db) == len(edited_plans)
+    assert _totals(db) == incremental
+    assert _summary(db) == summary
+
+
+def test_range_summary_matches_all_time_totals(db, edited_plans):
+    all_time = _summary(db)
+    created = [plan.created_at for plan in edited_plans]
+    in_range = _summary(
+        db, start=min(created) - timedelta(days=1), end=max(created) + timedelta(days=1)
+    )
+    assert in_range == all_time
+
+    empty = _summary(db, start=datetime.utcnow() + timedelta(days=1))
+    assert empty["plan_count"] == 0
+    assert empty["task_count"] == 0
+    assert empty["risks_by_severity"] == {}
+
+
+def test_summary_counts_match_stored_tasks(db, edited_plans):
+    summary = _summary(db)
+    stored = [json.loads(FeatureService.get_plan_by_id(plan.id, db).engineering_tasks) for plan in edited_plans]
+    assert summary["plan_count"] == 3
+    assert summary["task_count"] == sum(len(tasks) for plan in stored for tasks in plan.values())
+    assert summary["tasks_by_priority"].get("Low", 0) >= 1
@@ -0,0 +1,117 @@
+"""Tests for moving plans to compressed cold storage and back."""
+import json
+
+from sqlalchemy.orm import Session
+
+from app.database import create_unpooled_engine
+from app.models import FeaturePlan, PlanArchive
+from app.services.archive_service import ARCHIVED_PAYLOAD, ArchiveService, clear_payload_cache
+from app.services.feature_service import FeatureService
+
+PLAN_REQUEST = {
+    "goal": "Build a todo app with reminders",
+    "users": ["Students", "Teachers"],
+    "constraints": ["Offline support"],
+}
+
+
+def _create(client, **overrides) -> int:
+    response = client.post("/api/features/generate", json={**PLAN_REQUEST, **overrides})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _snapshot(client, plan_id: int) -> tuple[dict, str]:
+    plan = client.get(f"/api/features/{plan_id}")
+    export = client.get(f"/api/features/{plan_id}/export")
+    assert plan.status_code == 200 and export.status_code == 200
+    return plan.json(), export.text
+
+
+def _hot_row(db, plan_id: int) -> FeaturePlan:
+    db.expire_all()
+    return db.get(FeaturePlan, plan_id)
+
+
+def test_archive_read_edit_archive_round_trip(db, client):
+    plan_id = _create(client)
+    before = _snapshot(client, plan_id)
+
+    assert ArchiveService.archive_old_plans(db, older_than_days=-1) == 1
+    row = _hot_row(db, plan_id)
+    assert row.engineering_tasks == ARCHIVED_PAYLOAD
+    assert db.get(PlanArchive, plan_id) is not None
+
+    # Cold reads (LRU miss, then hit) match the hot plan, updated_at included
+    clear_payload_cache()
+    assert _snapshot(client, plan_id) == before
+    assert _snapshot(client, plan_id) == before
+    # Reading never writes the payload back to the hot table
+    assert _hot_row(db, plan_id).engineering_tasks == ARCHIVED_PAYLOAD
+
+    # Editing thaws the plan; untouched sections survive
+    tasks = before[0]["engineering_tasks"]
+    tasks["Frontend"][0]["priority"] = "Low"
+    del tasks["Database"]
+    response = client.put(f"/api/features/{plan_id}/tasks", json={"engineering_tasks": tasks})
+    assert response.status_code == 200
+    edited = _snapshot(client, plan_id)
+    assert edited[0]["engineering_tasks"] == tasks
+    assert edited[0]["user_stories"] == before[0]["user_stories"]
+    assert edited[0]["risks"] == before[0]["risks"]
+    assert db.get(PlanArchive, plan_id) is None
+    assert json.loads(_hot_row(db, plan_id).engineering_tasks) == tasks
+
+    # Archiving again stores the edited content
+    assert ArchiveService.archive_old_plans(db, older_than_days=-1) == 1
+    clear_payload_cache()
+    assert _snapshot(client, plan_id) == edited
+    assert ArchiveService.archive_old_plans(db, older_than_days=-1) == 0
+
+
+def test_unchanged_edit_of_archived_plan_keeps_payload(db, client):
+    plan_id = _create(client)
+    before = _snapshot(client, plan_id)
+    ArchiveService.archive_old_plans(db, older_than_days=-1)
+
+    # Same tasks as the hydrated plan: thawing must still write them back
+    response = client.put(
+        f"/api/features/{plan_id}/tasks",
+        json={"engineering_tasks": before[0]["engineering_tasks"]},
+    )
+    assert response.status_code == 200
+    assert db.get(PlanArchive, plan_id) is None
+    row = _hot_row(db, plan_id)
+    assert json.loads(row.engineering_tasks) == before[0]["engineering_tasks"]
+    assert json.loads(row.user_stories) == before[0]["user_stories"]
+
+
+def test_plan_edited_during_archiving_is_left_hot(db, client, monkeypatch):
+    edited_id = _create(client)
+    other_id = _create(client, goal="Build a recipe sharing site")
+    tasks = client.get(f"/api/features/{edited_id}").json()["engineering_tasks"]
+    tasks["Frontend"][0]["title"] = "Edited while archiving"
+
+    # Another worker edits the plan after the batch SELECT, before its UPDATE
+    execute = db.execute
+
+    def execute_after_concurrent_edit(statement, *args, **kwargs):
+        if getattr(statement, "is_update", False) and not edits_done:
+            edits_done.append(True)
+            other_engine = create_unpooled_engine()
+            try:
+                with Session(other_engine) as other:
+                    FeatureService.update_plan_tasks(edited_id, tasks, other)
+            finally:
+                other_engine.dispose()
+        return execute(statement, *args, **kwargs)
+
+    edits_done = []
+    monkeypatch.setattr(db, "execute", execute_after_concurrent_edit)
+    assert ArchiveService.archive_old_plans(db, older_than_days=-1) == 1
+
+    assert edits_done
+    assert db.get(PlanArchive, edited_id) is None
+    assert db.get(PlanArchive, other_id) is not None
+    assert json.loads(_hot_row(db, edited_id).engineering_tasks) == tasks
+    assert client.get(f"/api/features/{edited_id}").json()["engineering_tasks"] == tasks
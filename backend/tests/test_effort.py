@@ -0,0 +1,29 @@
+"""Tests for parsing free-text effort estimates."""
+import pytest
+
+from app.utils.effort import parse_effort
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2-3 days", (2.0, 3.0)),
+    ("1 day", (1.0, 1.0)),
+    ("1 week", (5.0, 5.0)),
+    ("1-2 weeks", (5.0, 10.0)),
+    ("4h", (0.5, 0.5)),
+    ("8 hours", (1.0, 1.0)),
+    ("2 to 4 hrs", (0.25, 0.5)),
+    ("1.5 days", (1.5, 1.5)),
+    ("3–5 d", (3.0, 5.0)),
+    ("1 sprint", (10.0, 10.0)),
+    ("2 months", (40.0, 40.0)),
+    ("3", (3.0, 3.0)),
+    ("5-3 Days", (3.0, 5.0)),
+    ("About 2 weeks", (10.0, 10.0)),
+])
+def test_parse_effort(text, expected):
+    assert parse_effort(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [None, "", "a while", "TBD", "2 fortnights"])
+def test_unparseable_effort(text):
+    assert parse_effort(text) is None
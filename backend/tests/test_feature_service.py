@@ -0,0 +1,107 @@
+"""Tests for plan generation with similar plan reuse."""
+import json
+
+import pytest
+
+from app.services import feature_service
+from app.services.feature_service import FeatureService
+from app.utils import llm
+
+GOAL = "Build a todo app with reminders"
+USERS = ["Students"]
+CONSTRAINTS = ["Offline"]
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Serve plans from a fake LLM; returns the user messages it received."""
+    calls = []
+
+    def chat(messages, use_cache=True):
+        calls.append(messages[-1]["content"])
+        return json.dumps(llm._mock_feature_plan("Build a recipe sharing site", USERS))
+
+    monkeypatch.setattr(llm.settings, "USE_MOCK_LLM", False)
+    monkeypatch.setattr(llm, "_chat", chat)
+    return calls
+
+
+@pytest.fixture
+def stored_plan(db):
+    plan_data = llm._mock_feature_plan(GOAL, USERS)
+    return FeatureService._save_plan(GOAL, USERS, CONSTRAINTS, plan_data, db)
+
+
+@pytest.mark.parametrize("mode", ["return", "seed"])
+def test_unrelated_goal_is_generated_without_reference(db, stored_plan, llm_calls, monkeypatch, mode):
+    monkeypatch.setattr(feature_service.settings, "SIMILAR_PLAN_REUSE", mode)
+    plan = FeatureService.generate_plan("Build a recipe sharing site", USERS, ["Mobile"], db)
+    assert plan.id != stored_plan.id
+    assert len(llm_calls) == 1
+    assert "Reference" not in llm_calls[0]
+
+
+def test_return_mode_reuses_similar_plan(db, stored_plan, llm_calls, monkeypatch):
+    monkeypatch.setattr(feature_service.settings, "SIMILAR_PLAN_REUSE", "return")
+    plan = FeatureService.generate_plan(GOAL, USERS, CONSTRAINTS, db)
+    assert plan.id == stored_plan.id
+    assert llm_calls == []
+
+
+def test_seed_mode_passes_similar_plan_to_llm(db, stored_plan, llm_calls, monkeypatch):
+    monkeypatch.setattr(feature_service.settings, "SIMILAR_PLAN_REUSE", "seed")
+    plan = FeatureService.generate_plan(GOAL + " and sharing", USERS, CONSTRAINTS, db)
+
+    # A new plan with the LLM's content, not a copy of the stored one
+    assert plan.id != stored_plan.id
+    assert plan.goal == GOAL + " and sharing"
+    assert json.loads(plan.user_stories) != json.loads(stored_plan.user_stories)
+    assert len(llm_calls) == 1
+    assert "Reference from an existing plan" in llm_calls[0]
+    assert json.loads(stored_plan.engineering_tasks)["Frontend"][0]["title"] in llm_calls[0]
+
+
+def test_seed_mode_references_each_section_in_sectioned_mode(db, stored_plan, monkeypatch):
+    monkeypatch.setattr(feature_service.settings, "SIMILAR_PLAN_REUSE", "seed")
+    monkeypatch.setattr(llm.settings, "USE_MOCK_LLM", False)
+    stored_tasks = json.loads(stored_plan.engineering_tasks)
+    prompts = {}
+
+    def chat(messages, use_cache=True):
+        key = messages[0]["content"]
+        for category, template in llm.CATEGORY_TEMPLATES.items():
+            if key == template._system_message["content"]:
+                prompts[category] = messages[-1]["content"]
+                return json.dumps({"tasks": stored_tasks[category]})
+        section = next(s for s, t in llm.SECTION_TEMPLATES.items() if key == t._system_message["content"])
+        prompts[section] = messages[-1]["content"]
+        return json.dumps({section: json.loads(getattr(stored_plan, section))})
+
+    monkeypatch.setattr(llm, "_chat", chat)
+    FeatureService.generate_plan(GOAL + " and sharing", USERS, CONSTRAINTS, db, sectioned=True)
+
+    assert "Reference from an existing plan" in prompts["user_stories"]
+    frontend_title = stored_tasks["Frontend"][0]["title"]
+    assert frontend_title in prompts["Frontend"]
+    assert frontend_title not in prompts["Backend"]
+
+
+def test_similar_search_does_not_decompress_archived_plans(db, stored_plan, monkeypatch):
+    from app.services.archive_service import ArchiveService
+
+    ArchiveService.archive_old_plans(db, older_than_days=-1)
+    loads = []
+    load_payload = ArchiveService._load_payload
+    monkeypatch.setattr(ArchiveService, "_load_payload", staticmethod(
+        lambda plan, session: loads.append(plan.id) or load_payload(plan, session)
+    ))
+
+    matches = FeatureService.find_similar_plans(GOAL, USERS, CONSTRAINTS, db)
+    assert [plan.id for plan, _ in matches] == [stored_plan.id]
+    assert loads == []
+
+    # Reuse still returns the full plan
+    monkeypatch.setattr(feature_service.settings, "SIMILAR_PLAN_REUSE", "return")
+    plan = FeatureService.generate_plan(GOAL, USERS, CONSTRAINTS, db)
+    assert loads == [stored_plan.id]
+    assert json.loads(plan.engineering_tasks) == llm._mock_feature_plan(GOAL, USERS)["engineering_tasks"]
@@ -0,0 +1,115 @@
+"""Tests for structural JSON diffs used by plan version history."""
+import copy
+
+import pytest
+
+from app.utils.json_diff import apply_patch, diff
+
+
+def _task(task_id, title, **extra):
+    return {"id": task_id, "title": title, "priority": "High", **extra}
+
+
+TASKS = {
+    "Frontend": [_task("FE-001", "Login form"), _task("FE-002", "Dashboard")],
+    "Backend": [_task("BE-001", "Auth API"), _task("BE-002", "Reports API")],
+    "Database": [],
+}
+
+
+def _round_trip(old, new):
+    snapshot = copy.deepcopy(old)
+    patch = diff(old, new)
+    assert apply_patch(old, patch) == new
+    # Applying never mutates the base value
+    assert old == snapshot
+    return patch
+
+
+def test_equal_values_give_no_patch():
+    assert diff(TASKS, copy.deepcopy(TASKS)) is None
+    assert apply_patch(TASKS, None) is TASKS
+
+
+@pytest.mark.parametrize("old, new", [
+    (1, 2),
+    ("a", None),
+    ([1], {"a": 1}),
+    ({"a": 1}, [1]),
+])
+def test_scalar_and_type_changes_replace(old, new):
+    assert _round_trip(old, new) == {"v": new}
+
+
+def test_reorder_reuses_old_elements():
+    new = copy.deepcopy(TASKS)
+    new["Frontend"].reverse()
+    patch = _round_trip(TASKS, new)
+    assert patch == {"d": {"Frontend": {"l": [1, 0]}}}
+
+
+def test_edit_matched_by_id():
+    new = copy.deepcopy(TASKS)
+    new["Backend"][1]["title"] = "Reports API v2"
+    new["Backend"].reverse()
+    patch = _round_trip(TASKS, new)
+    # Only the changed field travels, tied to the old element by its id
+    assert patch == {"d": {"Backend": {"l": [{"i": 1, "p": {"d": {"title": {"v": "Reports API v2"}}}}, 0]}}}
+
+
+def test_added_and_removed_elements():
+    new = copy.deepcopy(TASKS)
+    del new["Frontend"][0]
+    new["Database"].append(_task("DB-001", "Schema"))
+    patch = _round_trip(TASKS, new)
+    assert patch["d"]["Frontend"] == {"l": [1]}
+    assert patch["d"]["Database"] == {"l": [{"v": _task("DB-001", "Schema")}]}
+
+
+def test_new_id_is_not_paired_with_removed_element():
+    new = copy.deepcopy(TASKS)
+    new["Frontend"][0] = _task("FE-003", "Settings page")
+    patch = _round_trip(TASKS, new)
+    assert patch["d"]["Frontend"] == {"l": [{"v": _task("FE-003", "Settings page")}, 1]}
+
+
+def test_duplicate_elements():
+    old = [{"a": 1}, {"a": 1}, {"a": 2}]
+    new = [{"a": 2}, {"a": 1}, {"a": 1}, {"a": 1}]
+    patch = _round_trip(old, new)
+    assert patch == {"l": [2, 0, 1, {"v": {"a": 1}}]}
+
+
+def test_dict_keys_added_and_removed():
+    new = copy.deepcopy(TASKS)
+    del new["Database"]
+    new["Infrastructure"] = [_task("INF-001", "CI pipeline")]
+    patch = _round_trip(TASKS, new)
+    assert patch["r"] == ["Database"]
+    assert patch["d"] == {"Infrastructure": {"v": [_task("INF-001", "CI pipeline")]}}
+
+
+def test_nested_field_removed_from_matched_element():
+    old = [_task("FE-001", "Login form", estimated_effort="2 days")]
+    new = [_task("FE-001", "Login form")]
+    assert _round_trip(old, new) == {"l": [{"i": 0, "p": {"d": {}, "r": ["estimated_effort"]}}]}
+
+
+def test_chained_patches_replay_history():
+    versions = [copy.deepcopy(TASKS)]
+    for title in ("A", "B", "C"):
+        nxt = copy.deepcopy(versions[-1])
+        nxt["Frontend"].insert(0, _task(f"FE-{title}", title))
+        nxt["Backend"][0]["priority"] = title
+        versions.append(nxt)
+    patches = [diff(a, b) for a, b in zip(versions, versions[1:])]
+
+    value = versions[0]
+    for patch in patches:
+        value = apply_patch(value, patch)
+    assert value == versions[-1]
+
+
+def test_invalid_patch():
+    with pytest.raises(ValueError):
+        apply_patch({"a": 1}, {"x": 1})
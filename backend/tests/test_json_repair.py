@@ -0,0 +1,145 @@
+"""Tests for tolerant JSON extraction and repair of LLM output."""
+import json
+
+import pytest
+
+from app.utils.json_repair import IncrementalJSONParser, parse_json_tolerant, strip_fences
+
+
+def test_valid_json_unchanged():
+    data = {"a": [1, 2, {"b": "c"}], "d": None, "e": True}
+    assert parse_json_tolerant(json.dumps(data)) == data
+
+
+def test_ignores_chatter_around_object():
+    text = 'Sure! Here is the plan:\n{"a": 1}\nLet me know if you need more.'
+    assert parse_json_tolerant(text) == {"a": 1}
+
+
+def test_no_object_returns_none():
+    assert parse_json_tolerant("I cannot help with that.") is None
+    assert parse_json_tolerant("") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1,}', {"a": 1}),
+    ('{"a": [1, 2,],}', {"a": [1, 2]}),
+    ('{"a": [1, 2 , \n ] , "b": {"c": 3,\n}}', {"a": [1, 2], "b": {"c": 3}}),
+])
+def test_trailing_commas(text, expected):
+    assert parse_json_tolerant(text) == expected
+
+
+def test_comma_inside_string_kept():
+    assert parse_json_tolerant('{"a": "x,}",}') == {"a": "x,}"}
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Truncated mid-string value
+    ('{"title": "Login", "description": "As a user I wa', {"title": "Login", "description": "As a user I wa"}),
+    # Truncated mid-key: the dangling key is dropped
+    ('{"title": "Login", "descri', {"title": "Login"}),
+    # Truncated after a key, before its value
+    ('{"title": "Login", "risks":', {"title": "Login"}),
+    # Truncated inside nested containers
+    ('{"tasks": [{"id": "FE-001", "title": "Form"}, {"id": "FE-0', {"tasks": [{"id": "FE-001", "title": "Form"}, {"id": "FE-0"}]}),
+    # Truncated right after an escape character
+    ('{"a": "line\\', {"a": "line"}),
+])
+def test_truncation(text, expected):
+    assert parse_json_tolerant(text) == expected
+
+
+def test_unescaped_quotes_inside_string():
+    text = '{"title": "Add "remember me" checkbox", "priority": "High"}'
+    assert parse_json_tolerant(text) == {"title": 'Add "remember me" checkbox', "priority": "High"}
+
+
+def test_raw_control_characters_inside_string():
+    assert parse_json_tolerant('{"a": "line one\nline\ttwo"}') == {"a": "line one\nline\ttwo"}
+
+
+def test_mismatched_closing_bracket():
+    assert parse_json_tolerant('{"a": [1, 2}}') == {"a": [1, 2]}
+
+
+def test_fenced_output():
+    assert parse_json_tolerant('```json\n{"a": 1}\n```') == {"a": 1}
+
+
+def test_fences_keep_backticks_inside_strings():
+    text = '```json\n{"cmd": "run ```npm test``` first", "code": "```"}\n```'
+    assert parse_json_tolerant(text) == {"cmd": "run ```npm test``` first", "code": "```"}
+
+
+def test_strip_fences_leaves_unfenced_text():
+    text = '{"a": "use `x` and ```y```"}'
+    assert strip_fences(text) == text
+
+
+def test_strip_fences_continuation_chunks():
+    # A continuation may carry only the closing fence, or only the opening one
+    assert strip_fences('ing"]}\n```') == 'ing"]}\n'
+    assert strip_fences('more text"\n```') == 'more text"\n'
+    assert strip_fences('```json\n{"a": 1') == '\n{"a": 1'
+
+
+def test_incremental_feed_matches_single_parse():
+    text = '{"goal": "Build "fast" app", "tasks": [{"id": 1,}, {"id": 2}],}'
+    parser = IncrementalJSONParser()
+    for ch in text:
+        parser.feed(ch)
+    assert parser.complete
+    assert parser.result() == parse_json_tolerant(text)
+
+
+def test_continuation_completes_truncated_object():
+    parser = IncrementalJSONParser()
+    parser.feed('Here you go: {"stories": [{"title": "Sign')
+    assert parser.started and parser.truncated
+    assert parser.result() == {"stories": [{"title": "Sign"}]}
+
+    parser.feed(' up"}], "risks": []} trailing chatter')
+    assert parser.complete and not parser.truncated
+    assert parser.result() == {"stories": [{"title": "Sign up"}], "risks": []}
+    assert parser.raw_text == '{"stories": [{"title": "Sign up"}], "risks": []}'
+
+
+def test_quote_split_across_chunks():
+    # Whether a quote ends the string depends on the next chunk
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": "say "')
+    parser.feed('hi" now"}')
+    assert parser.result() == {"a": 'say "hi" now'}
+
+
+def test_complete_but_misparsed_object_is_not_cut():
+    # An unescaped quote followed by a comma ends the string early, so the
+    # braces balance before the real end of the object. Cutting back to the
+    # last good element would silently drop everything after it.
+    text = (
+        '{"tasks": {"Frontend": [{"id": "FE-001", "description": "Add "OAuth", login"}, '
+        '{"id": "FE-002"}], "Backend": [{"id": "BE-001"}]}, "risks": [{"risk": "Scale"}]}'
+    )
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    assert parser.complete
+    assert parser.result() is None
+    assert parser.partial_key is None
+
+
+@pytest.mark.parametrize("text, expected, partial_key", [
+    ('{"a": [1], "b": {"x": [1, 2', {"a": [1], "b": {"x": [1, 2]}}, "b"),
+    ('{"a": [1], "b": "some te', {"a": [1], "b": "some te"}, "b"),
+    # Cut back to an element boundary inside "b"
+    ('{"a": [1], "b": [{"id": 1}, {"id": 2, "ti', {"a": [1], "b": [{"id": 1}, {"id": 2}]}, "b"),
+    # Everything kept is complete
+    ('{"a": [1], "b": [2],', {"a": [1], "b": [2]}, None),
+    ('{"a": [1], "b": [2], "c', {"a": [1], "b": [2]}, None),
+    ('{"a": [1], "b": [2]}', {"a": [1], "b": [2]}, None),
+])
+def test_partial_key_reports_value_cut_by_truncation(text, expected, partial_key):
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    assert parser.result() == expected
+    assert parser.partial_key == partial_key
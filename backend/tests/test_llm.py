@@ -0,0 +1,74 @@
+"""Tests for LLM plan generation with repaired and regenerated sections."""
+import json
+
+import pytest
+
+from app.utils import llm
+
+
+@pytest.fixture
+def fake_chat(monkeypatch):
+    """Replace the LLM with canned responses; returns the list of calls."""
+    plan = llm._mock_feature_plan("Build a todo app", ["Students"])
+    responses = {"plan": json.dumps(plan, indent=2)}
+    calls = []
+
+    def chat(messages, use_cache=True):
+        system = messages[0]["content"]
+        for section, template in llm.SECTION_TEMPLATES.items():
+            if system == template._system_message["content"]:
+                calls.append(section)
+                return json.dumps({section: plan[section]})
+        calls.append("plan" if len(messages) == 2 else "continuation")
+        return responses["continuation" if len(messages) > 2 else "plan"]
+
+    monkeypatch.setattr(llm.settings, "USE_MOCK_LLM", False)
+    monkeypatch.setattr(llm, "_chat", chat)
+    return plan, responses, calls
+
+
+def test_valid_plan_needs_one_call(fake_chat):
+    plan, _, calls = fake_chat
+    assert llm.generate_feature_plan("Build a todo app", ["Students"], ["Offline"]) == plan
+    assert calls == ["plan"]
+
+
+def test_misparsed_plan_is_regenerated_not_truncated(fake_chat):
+    plan, responses, calls = fake_chat
+    description = plan["engineering_tasks"]["Frontend"][0]["description"]
+    responses["plan"] = responses["plan"].replace(
+        json.dumps(description), '"Add "OAuth", login. ' + description[1:], 1
+    )
+
+    result = llm.generate_feature_plan("Build a todo app", ["Students"], ["Offline"])
+
+    # No category is lost to the bad quote; every section is asked for again
+    assert result == plan
+    assert calls == ["plan", "user_stories", "engineering_tasks", "risks"]
+
+
+def test_truncated_plan_is_not_returned_partial(fake_chat):
+    _, responses, calls = fake_chat
+    text = responses["plan"]
+    # Cut off inside the Backend tasks, and continuations add nothing
+    responses["plan"] = text[:text.index('"Backend"') + 40]
+    responses["continuation"] = ""
+
+    assert llm.generate_feature_plan("Build a todo app", ["Students"], ["Offline"], max_retries=3) is None
+    assert calls == ["plan", "continuation", "continuation", "continuation"]
+
+
+def test_truncated_section_response_is_retried(fake_chat, monkeypatch):
+    plan, _, _ = fake_chat
+    tasks = plan["engineering_tasks"]["Backend"]
+    full = json.dumps({"tasks": tasks})
+    responses = [full[:full.rindex('"title"')], full]
+
+    monkeypatch.setattr(llm, "_chat", lambda messages, use_cache=True: responses.pop(0))
+    value = llm._request_section_with_retry(
+        "engineering_tasks:Backend", "Build a todo app", ["Students"], ["Offline"], max_retries=2
+    )
+
+    # The first answer lost the last task's fields; it is not used as a shorter list
+    assert value == llm._validate_section("engineering_tasks", {"Backend": tasks})["Backend"]
+    assert responses == []
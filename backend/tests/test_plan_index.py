@@ -0,0 +1,58 @@
+"""Tests for the plan similarity index."""
+import json
+
+import pytest
+
+from app.models import FeaturePlan
+from app.services import plan_index as plan_index_module
+from app.services.plan_index import PlanSimilarityIndex
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    """Record the goals embedded by the index."""
+    goals = []
+    embed = plan_index_module.embed_plan_request
+
+    def recording(goal, users, constraints):
+        goals.append(goal)
+        return embed(goal, users, constraints)
+
+    monkeypatch.setattr(plan_index_module, "embed_plan_request", recording)
+    return goals
+
+
+def _store(db, goal):
+    plan = FeaturePlan(
+        goal=goal, users=json.dumps(["Students"]), constraints=json.dumps(["Offline"]),
+        user_stories="[]", engineering_tasks="{}", risks="[]",
+    )
+    db.add(plan)
+    db.commit()
+    return plan
+
+
+def test_added_plan_is_not_embedded_again_by_sync(db, embedded):
+    index = PlanSimilarityIndex()
+    _store(db, "Build a todo app")
+    index.sync(db)
+    index.add_plan(_store(db, "Build a recipe sharing site"))
+    embedded.clear()
+
+    index.sync(db)
+    assert embedded == []
+    assert len(index) == 2
+
+
+def test_sync_fetches_plans_below_an_added_id(db, embedded):
+    index = PlanSimilarityIndex()
+    _store(db, "Build a todo app")  # e.g. written by another worker
+    index.add_plan(_store(db, "Build a recipe sharing site"))
+    embedded.clear()
+
+    index.sync(db)
+    assert embedded == ["Build a todo app"]
+    assert len(index) == 2
+
+    results = index.search(db, "Build a todo app", ["Students"], ["Offline"])
+    assert [plan_id for plan_id, _ in results][0] == 1
@@ -0,0 +1,23 @@
+"""Tests for rate limit client identification."""
+from starlette.requests import Request
+
+from app.utils import rate_limit
+
+
+def _request(api_key=None, host="10.0.0.1"):
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return Request({"type": "http", "headers": headers, "client": (host, 1234)})
+
+
+def test_known_api_key_is_hashed(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_API_KEYS", {"secret-key-123"})
+    key = rate_limit.client_key(_request("secret-key-123"))
+    assert key.startswith("key:")
+    assert "secret" not in key
+    assert key == rate_limit.client_key(_request("secret-key-123", host="10.0.0.2"))
+
+
+def test_unknown_api_key_falls_back_to_ip(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_API_KEYS", {"secret-key-123"})
+    assert rate_limit.client_key(_request("random-key")) == "ip:10.0.0.1"
+    assert rate_limit.client_key(_request()) == "ip:10.0.0.1"
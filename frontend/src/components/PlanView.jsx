@@ -1,10 +1,15 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import './PlanView.css';
 
 export default function PlanView({ plan, onExport, onUpdate }) {
   const [editingTaskId, setEditingTaskId] = useState(null);
   const [tasks, setTasks] = useState(plan.engineering_tasks);
 
+  // Show changes pushed from other tabs or clients
+  useEffect(() => {
+    setTasks(plan.engineering_tasks);
+  }, [plan.engineering_tasks]);
+
   const handleTaskReorder = (category, fromIndex, toIndex) => {
     const newTasks = { ...tasks };
     const categoryTasks = [...newTasks[category]];
@@ -15,7 +20,7 @@ export default function PlanView({ plan, onExport, onUpdate }) {
   };
 
   const handleTaskEdit = (category, index, updatedTask) => {
-    const newTasks = { ...tasks };
+    const newTasks = { ...tasks, [category]: [...tasks[category]] };
     newTasks[category][index] = updatedTask;
     setTasks(newTasks);
     setEditingTaskId(null);
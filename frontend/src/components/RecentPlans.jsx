@@ -1,30 +1,8 @@
-import React, { useEffect, useState } from 'react';
-import { featureAPI } from '../services/api';
+import React from 'react';
 import './RecentPlans.css';
 
-export default function RecentPlans({ onSelectPlan }) {
-  const [plans, setPlans] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState('');
-
-  useEffect(() => {
-    fetchPlans();
-  }, []);
-
-  const fetchPlans = async () => {
-    try {
-      setLoading(true);
-      const response = await featureAPI.getRecentPlans(5);
-      setPlans(response.data);
-      setError('');
-    } catch (error) {
-      console.error('Error fetching plans:', error);
-      setError('Failed to load recent plans');
-    } finally {
-      setLoading(false);
-    }
-  };
-
+// The list is owned by Home, which keeps it current from plan events
+export default function RecentPlans({ plans, loading, error, onSelectPlan }) {
   if (loading) {
     return <div className="recent-plans-loading">Loading recent plans...</div>;
   }
@@ -1,17 +1,101 @@
-import React, { useState } from 'react';
+import React, { useCallback, useEffect, useRef, useState } from 'react';
 import FeatureForm from '../components/FeatureForm';
 import PlanView from '../components/PlanView';
 import RecentPlans from '../components/RecentPlans';
 import Health from '../components/Health';
-import { featureAPI } from '../services/api';
+import { featureAPI, planEvents } from '../services/api';
+import { applyPatch } from '../utils/jsonPatch';
 import './Home.css';
 
+const RECENT_PLANS_LIMIT = 5;
+
 export default function Home() {
   const [currentPlan, setCurrentPlan] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
-  const [shouldRefreshRecent, setShouldRefreshRecent] = useState(false);
+  const [recentPlans, setRecentPlans] = useState([]);
+  const [recentLoading, setRecentLoading] = useState(true);
+  const [recentError, setRecentError] = useState('');
+  // Latest plan for event handlers, which may run before a re-render
+  const currentPlanRef = useRef(null);
+
+  const showPlan = (plan) => {
+    currentPlanRef.current = plan;
+    setCurrentPlan(plan);
+  };
+
+  const fetchRecentPlans = useCallback(async () => {
+    try {
+      const response = await featureAPI.getRecentPlans(RECENT_PLANS_LIMIT);
+      setRecentPlans(response.data);
+      setRecentError('');
+    } catch (error) {
+      console.error('Error fetching plans:', error);
+      setRecentError('Failed to load recent plans');
+    } finally {
+      setRecentLoading(false);
+    }
+  }, []);
+
+  const reloadPlan = async (planId) => {
+    try {
+      const response = await featureAPI.getPlan(planId);
+      if (currentPlanRef.current?.id === planId) {
+        showPlan(response.data);
+      }
+    } catch (error) {
+      console.error('Error reloading plan:', error);
+    }
+  };
+
+  const handlePlanEvent = (event) => {
+    const plan = currentPlanRef.current;
+    if (event.type === 'plan_created') {
+      setRecentPlans((plans) =>
+        [event.plan, ...plans.filter((p) => p.id !== event.plan.id)].slice(
+          0,
+          RECENT_PLANS_LIMIT
+        )
+      );
+    } else if (event.type === 'plan_updated') {
+      if (!plan || plan.id !== event.plan_id || plan.updated_at === event.updated_at) {
+        return;
+      }
+      // Patches apply only to the exact version they were made from
+      if (plan.updated_at !== event.previous_updated_at) {
+        reloadPlan(plan.id);
+        return;
+      }
+      try {
+        showPlan({
+          ...plan,
+          engineering_tasks: applyPatch(
+            plan.engineering_tasks,
+            event.patch.engineering_tasks
+          ),
+          updated_at: event.updated_at,
+        });
+      } catch (error) {
+        reloadPlan(plan.id);
+      }
+    } else if (event.type === 'resync') {
+      fetchRecentPlans();
+      if (plan) {
+        reloadPlan(plan.id);
+      }
+    }
+  };
+
+  // Subscribe once; the ref always points at the latest handler
+  const planEventHandler = useRef(handlePlanEvent);
+  planEventHandler.current = handlePlanEvent;
+
+  // Load the list once, then keep it and the open plan current from pushed events
+  useEffect(() => {
+    fetchRecentPlans();
+    return planEvents.subscribe((event) => planEventHandler.current(event));
+  }, [fetchRecentPlans]);
 
   const handleGeneratePlan = async (data) => {
     try {
@@ -25,9 +109,8 @@ export default function Home() {
         data.constraints
       );
 
-      setCurrentPlan(response.data);
+      showPlan(response.data);
       setSuccess('Feature plan generated successfully!');
-      setShouldRefreshRecent(true);
 
       // Clear success message after 3 seconds
       setTimeout(() => setSuccess(''), 3000);
@@ -47,7 +130,7 @@ export default function Home() {
       setLoading(true);
       setError('');
       const response = await featureAPI.getPlan(planId);
-      setCurrentPlan(response.data);
+      showPlan(response.data);
     } catch (error) {
       console.error('Error fetching plan:', error);
       setError('Failed to load feature plan');
@@ -121,12 +204,17 @@ export default function Home() {
         {!currentPlan ? (
           <>
             <FeatureForm onSubmit={handleGeneratePlan} isLoading={loading} />
-            <RecentPlans onSelectPlan={handleSelectPlan} />
+            <RecentPlans
+              plans={recentPlans}
+              loading={recentLoading}
+              error={recentError}
+              onSelectPlan={handleSelectPlan}
+            />
           </>
         ) : (
           <>
             <button
-              onClick={() => setCurrentPlan(null)}
+              onClick={() => showPlan(null)}
               className="btn-back"
             >
               ← Back to Form
@@ -37,6 +37,64 @@ export const featureAPI = {
     apiClient.get(`/features/${planId}/export`),
 };
 
+// Server-Sent Events of plan changes (plan_created, plan_updated, resync).
+// One connection is shared by all listeners and closed when the last one leaves;
+// EventSource reconnects on its own and replays missed events when it can.
+const PLAN_EVENT_TYPES = ['plan_created', 'plan_updated', 'resync'];
+const PLAN_EVENTS_RETRY_MS = 5000;
+const planEventListeners = new Set();
+let planEventSource = null;
+let planEventRetry = null;
+
+const dispatchPlanEvent = (event) => {
+  planEventListeners.forEach((listener) => listener(event));
+};
+
+const openPlanEvents = (afterFailure = false) => {
+  const source = new EventSource(`${API_BASE_URL}/features/events`);
+  PLAN_EVENT_TYPES.forEach((type) =>
+    source.addEventListener(type, (message) =>
+      dispatchPlanEvent(JSON.parse(message.data))
+    )
+  );
+  if (afterFailure) {
+    // A fresh connection cannot replay what was missed while closed
+    source.addEventListener('open', () => dispatchPlanEvent({ type: 'resync' }), {
+      once: true,
+    });
+  }
+  source.onerror = () => {
+    // The browser retries on its own unless the server refused the stream
+    if (source.readyState === EventSource.CLOSED && planEventSource === source) {
+      planEventSource = null;
+      planEventRetry = setTimeout(() => {
+        planEventRetry = null;
+        if (planEventListeners.size > 0) {
+          planEventSource = openPlanEvents(true);
+        }
+      }, PLAN_EVENTS_RETRY_MS);
+    }
+  };
+  return source;
+};
+
+export const planEvents = {
+  // Subscribe to plan events; returns an unsubscribe function
+  subscribe: (listener) => {
+    planEventListeners.add(listener);
+    if (!planEventSource && !planEventRetry) {
+      planEventSource = openPlanEvents();
+    }
+    return () => {
+      planEventListeners.delete(listener);
+      if (planEventListeners.size === 0 && planEventSource) {
+        planEventSource.close();
+        planEventSource = null;
+      }
+    };
+  },
+};
+
 export const healthAPI = {
   // Get system health status
   getStatus: () =>
@@ -0,0 +1,49 @@
+// Applies patches produced by the backend's app/utils/json_diff.py.
+// Patch format (null means "unchanged"):
+//   { v: value }                      replace with value
+//   { d: { key: patch }, r: [keys] }  patch/add object keys, remove keys in "r"
+//   { l: [item, ...] }                rebuild an array; each item is
+//     number                          the old element at that index, unchanged
+//     { i: index, p: patch }          the old element at that index, patched
+//     { v: value }                    a new element
+// The input value is never modified.
+export function applyPatch(value, patch) {
+  if (patch === null || patch === undefined) {
+    return value;
+  }
+  if ('v' in patch) {
+    return patch.v;
+  }
+  if ('d' in patch) {
+    const removed = new Set(patch.r || []);
+    const result = {};
+    Object.entries(value || {}).forEach(([key, item]) => {
+      if (!removed.has(key)) {
+        result[key] = item;
+      }
+    });
+    Object.entries(patch.d).forEach(([key, sub]) => {
+      result[key] = applyPatch(value?.[key], sub);
+    });
+    return result;
+  }
+  if ('l' in patch) {
+    return patch.l.map((item) => {
+      if (typeof item === 'number') {
+        return checkedIndex(value, item);
+      }
+      if ('i' in item) {
+        return applyPatch(checkedIndex(value, item.i), item.p);
+      }
+      return item.v;
+    });
+  }
+  throw new Error('Invalid patch');
+}
+
+function checkedIndex(list, index) {
+  if (!Array.isArray(list) || index >= list.length) {
+    throw new Error('Patch does not match the current value');
+  }
+  return list[index];
+}